@@ -0,0 +1,110 @@
+"""
+Latency vs throughput of the micro-batching forecast server.
+
+Fires open-loop Poisson traffic at each target rate and reports p50/p99
+request latency and achieved throughput, for ForecastServer and for the
+baseline of calling PMRDB.forecast directly on the event loop.
+
+    python benchmarks/serving_load.py [--rates 200 1000 5000] [--duration 2]
+                                      [--max-batch 64] [--max-delay-ms 2]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pmrdb.serving import ForecastClient, ForecastServer  # noqa: E402
+
+from fixtures import fitted_model  # noqa: E402
+
+
+class DirectClient:
+    """
+    Baseline: PMRDB.forecast called inline on the event loop.
+    """
+
+    def __init__(self, db, n_samples):
+        self.db = db
+        self.n_samples = n_samples
+
+    async def forecast(self, observation):
+        return self.db.forecast(observation, self.n_samples)
+
+
+async def drive(client, rate, duration, rng):
+    """
+    Open-loop load: requests start on a Poisson schedule whether or not
+    earlier ones have finished. Latency runs from the scheduled arrival,
+    so time spent waiting for a busy event loop is included.
+
+    returns: (achieved requests / s, latencies in seconds)
+    """
+    n = max(int(rate * duration), 1)
+    arrivals = np.cumsum(rng.exponential(1 / rate, n))
+    observations = rng.normal(0, 1, (n, 2))
+    latencies = np.empty(n)
+
+    async def request(i, arrival):
+        await client.forecast({"T": observations[i, 0], "V": observations[i, 1]})
+        latencies[i] = time.perf_counter() - arrival
+
+    start = time.perf_counter()
+    tasks = []
+    for i, t in enumerate(arrivals):
+        delay = start + t - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(request(i, start + t)))
+
+    await asyncio.gather(*tasks)
+    return n / (time.perf_counter() - start), latencies
+
+
+async def run(mode, db, rate, args):
+    rng = np.random.default_rng(args.seed)
+
+    if mode == "direct":
+        throughput, latencies = await drive(DirectClient(db, args.n_samples), rate, args.duration, rng)
+        batches = len(latencies)
+    else:
+        async with ForecastServer(db, args.max_batch, args.max_delay_ms, args.n_samples) as server:
+            throughput, latencies = await drive(ForecastClient(server), rate, args.duration, rng)
+        batches = server.n_batches
+
+    p50, p99 = np.percentile(latencies * 1000, [50, 99])
+
+    return {
+        "mode": mode,
+        "target_rps": rate,
+        "achieved_rps": throughput,
+        "mean_batch": len(latencies) / max(batches, 1),
+        "p50_ms": p50,
+        "p99_ms": p99,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rates", type=float, nargs="+", default=[200, 1000, 5000])
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-delay-ms", type=float, default=2.0)
+    parser.add_argument("--n-samples", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    db, _, _ = fitted_model(20000)
+    results = [
+        asyncio.run(run(mode, db, rate, args))
+        for rate in args.rates
+        for mode in ("direct", "batched")
+    ]
+
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,77 @@
+"""
+Startup cost of `import pmrdb.pmrdb`.
+
+Runs the import in fresh interpreters and reports wall time and peak
+RSS per run, plus which heavy optional dependencies got loaded.
+
+    python benchmarks/startup.py [--runs 10] [--module pmrdb.pmrdb]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("torch", "scipy.stats", "scipy.special")
+
+
+def run_once(module):
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    out = proc.stdout.read()
+    # wait4 gives the rusage of this child alone
+    _, status, rusage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed with exit code {proc.returncode}")
+
+    # ru_maxrss is in KiB on Linux
+    return {
+        "wall_s": elapsed,
+        "peak_rss_mb": rusage.ru_maxrss / 1024,
+        "heavy_modules": [m for m in out.strip().split(",") if m],
+    }
+
+
+def measure(module="pmrdb.pmrdb", runs=10):
+    # one warm-up run so the OS file cache is populated
+    run_once(module)
+    results = [run_once(module) for _ in range(runs)]
+
+    wall = [r["wall_s"] for r in results]
+    rss = [r["peak_rss_mb"] for r in results]
+
+    return {
+        "module": module,
+        "runs": runs,
+        "wall_s_median": statistics.median(wall),
+        "wall_s_min": min(wall),
+        "peak_rss_mb_median": statistics.median(rss),
+        "heavy_modules": results[-1]["heavy_modules"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--module", default="pmrdb.pmrdb")
+    args = parser.parse_args()
+
+    print(json.dumps(measure(args.module, args.runs), indent=2))
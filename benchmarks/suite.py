@@ -0,0 +1,288 @@
+"""
+Hot-path benchmark suite with scaling curves and a JSON baseline.
+
+Times posterior inference (vs hypotheses, modalities and rows),
+distribution pdf/sampling, fusion, PMRDB.forecast and synthetic data
+generation. Each case reports the median and best time per call over
+several repeats, plus peak traced memory (tracemalloc) of one call.
+
+    python benchmarks/suite.py [--quick] [--filter posterior] [--save baseline.json]
+    python benchmarks/suite.py --compare baseline.json [--threshold 1.25]
+
+--compare exits with status 1 when a case is slower than the baseline
+by more than --threshold (median time ratio).
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pmrdb.distributions import (  # noqa: E402
+    BetaDistribution,
+    DirichletDistribution,
+    GaussianDistribution,
+)
+from pmrdb.fusion import fuse_dirichlet, fuse_gaussians, multimodal_fusion  # noqa: E402
+from pmrdb.probability_space import ProbabilitySpace  # noqa: E402
+from synthetic_data.generator import SyntheticDataGenerator  # noqa: E402
+
+from fixtures import fitted_model  # noqa: E402
+
+
+# ----------------------------
+# CASES
+# ----------------------------
+# Each case builder takes its parameters and returns a zero-argument
+# callable; setup cost stays outside the timed region.
+
+def _space(n_hyp, n_mod, rng):
+    names = [f"H{i}" for i in range(n_hyp)]
+    space = ProbabilitySpace(log_space=True)
+    space.add_hypotheses(names, np.ones(n_hyp))
+    for m in range(n_mod):
+        space.register_distribution_table(f"M{m}", {
+            h: GaussianDistribution(mu, 1.0) for h, mu in zip(names, rng.normal(0, 2, n_hyp))
+        })
+    return space
+
+
+def posterior_case(n_hyp, n_mod):
+    rng = np.random.default_rng(0)
+    space = _space(n_hyp, n_mod, rng)
+    evidence = {f"M{m}": float(rng.normal()) for m in range(n_mod)}
+    return lambda: space.posterior(evidence)
+
+
+def posterior_batch_case(n_hyp, n_mod, n_rows):
+    rng = np.random.default_rng(0)
+    space = _space(n_hyp, n_mod, rng)
+    columns = {f"M{m}": rng.normal(0, 2, n_rows) for m in range(n_mod)}
+    return lambda: space.posterior_batch(columns)
+
+
+def distribution_case(dist, op, n):
+    rng = np.random.default_rng(0)
+
+    if dist == "gaussian":
+        d, x = GaussianDistribution(0.3, 1.5), rng.normal(0, 1, n)
+    elif dist == "beta":
+        d, x = BetaDistribution(2.0, 5.0), rng.random(n)
+    else:
+        d, x = DirichletDistribution([2.0, 3.0, 4.0]), rng.dirichlet([1.0, 1.0, 1.0], n)
+
+    if op == "pdf":
+        return lambda: d.pdf(x)
+    return lambda: d.sample(n, rng)
+
+
+def fusion_case(kind, n):
+    rng = np.random.default_rng(0)
+
+    if kind == "gaussians":
+        dists = [GaussianDistribution(m, v) for m, v in zip(rng.normal(0, 1, n), rng.uniform(0.5, 2, n))]
+        return lambda: fuse_gaussians(dists)
+
+    if kind == "dirichlet":
+        dists = [DirichletDistribution(a) for a in rng.uniform(0.5, 3, (n, 3))]
+        return lambda: fuse_dirichlet(dists)
+
+    # multimodal: build the fused density and evaluate it on n points
+    posteriors = {
+        "T": {"dist": GaussianDistribution(0.2, 0.5), "weight": 1.0},
+        "V": {"dist": GaussianDistribution(-0.1, 0.8), "weight": 0.5},
+    }
+    x = rng.normal(0, 1, n)
+    return lambda: multimodal_fusion(posteriors).pdf(x)
+
+
+def forecast_case(n_samples):
+    db, _, _ = fitted_model(10000, signals={m: (0.5, -0.5, 1.0) for m in ("T", "R", "V")})
+    obs = {"T": 0.2, "R": 0.1, "V": -0.3}
+    return lambda: db.forecast(obs, n_samples)
+
+
+def generate_case(n, columnar):
+    if columnar:
+        return lambda: SyntheticDataGenerator(n_samples=n, seed=0).generate_columns()
+    return lambda: SyntheticDataGenerator(n_samples=n, seed=0).generate()
+
+
+def cases(quick=False):
+    """
+    returns: list of (case id, builder, params)
+    """
+    hyps = [2, 16, 128] if quick else [2, 16, 128, 1024, 8192]
+    mods = [1, 2, 4] if quick else [1, 2, 4, 8]
+    rows = [100, 10_000] if quick else [100, 10_000, 1_000_000]
+    n = 10_000 if quick else 100_000
+
+    out = []
+    for h in hyps:
+        out.append((f"posterior/H={h},M=3", posterior_case, {"n_hyp": h, "n_mod": 3}))
+    for m in mods:
+        out.append((f"posterior/H=16,M={m}", posterior_case, {"n_hyp": 16, "n_mod": m}))
+    for r in rows:
+        out.append((f"posterior_batch/H=16,M=3,N={r}", posterior_batch_case,
+                    {"n_hyp": 16, "n_mod": 3, "n_rows": r}))
+
+    for dist in ("gaussian", "beta", "dirichlet"):
+        for op in ("pdf", "sample"):
+            out.append((f"{dist}/{op}/N={n}", distribution_case, {"dist": dist, "op": op, "n": n}))
+
+    out.append(("fusion/gaussians/N=1000", fusion_case, {"kind": "gaussians", "n": 1000}))
+    out.append(("fusion/dirichlet/N=1000", fusion_case, {"kind": "dirichlet", "n": 1000}))
+    out.append((f"fusion/multimodal/N={n}", fusion_case, {"kind": "multimodal", "n": n}))
+
+    for s in (1, 50):
+        out.append((f"forecast/samples={s}", forecast_case, {"n_samples": s}))
+
+    out.append(("generate/objects/N=10000", generate_case, {"n": 10_000, "columnar": False}))
+    out.append((f"generate/columns/N={10 * n}", generate_case, {"n": 10 * n, "columnar": True}))
+
+    return out
+
+
+# ----------------------------
+# MEASUREMENT
+# ----------------------------
+def time_call(fn, repeats=5, min_time=0.05):
+    """
+    Per-call seconds over `repeats` rounds; each round runs enough
+    calls to last at least min_time.
+    """
+    fn()  # warm-up (lazy imports, caches)
+
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= max(2, int(min_time / max(elapsed, 1e-9)))
+
+    rounds = [elapsed / loops]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        rounds.append((time.perf_counter() - start) / loops)
+
+    return {"median_s": statistics.median(rounds), "min_s": min(rounds), "loops": loops}
+
+
+def peak_memory(fn):
+    """
+    Peak bytes allocated through Python's allocators during one call.
+    """
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(quick=False, pattern=None, repeats=5, min_time=0.05):
+    results = {}
+
+    for case_id, builder, params in cases(quick):
+        if pattern and pattern not in case_id:
+            continue
+
+        fn = builder(**params)
+        results[case_id] = {
+            **time_call(fn, repeats, min_time),
+            "peak_kb": peak_memory(fn) / 1024,
+            "params": params,
+        }
+        r = results[case_id]
+        print(f"{case_id:<40} {r['median_s'] * 1e3:10.4f} ms  {r['peak_kb']:10.1f} KiB", file=sys.stderr)
+
+    return results
+
+
+def metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    return {
+        "commit": commit,
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+    }
+
+
+def compare(results, baseline, threshold=1.25):
+    """
+    returns: (rows, regressions) with rows of
+             (case id, baseline ms, current ms, ratio)
+    """
+    rows, regressions = [], []
+
+    for case_id, r in results.items():
+        base = baseline["results"].get(case_id)
+        if base is None:
+            continue
+
+        ratio = r["median_s"] / base["median_s"]
+        rows.append((case_id, base["median_s"] * 1e3, r["median_s"] * 1e3, ratio))
+        if ratio > threshold:
+            regressions.append(case_id)
+
+    return rows, regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="smaller sizes")
+    parser.add_argument("--filter", default=None, help="only cases whose id contains this")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--save", default=None, help="write results to this JSON file")
+    parser.add_argument("--compare", default=None, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    report = {
+        "meta": metadata(),
+        "results": run(args.quick, args.filter, args.repeats, args.min_time),
+    }
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        rows, regressions = compare(report["results"], baseline, args.threshold)
+
+        print(f"{'case':<40} {'base ms':>10} {'now ms':>10} {'ratio':>7}")
+        for case_id, base_ms, now_ms, ratio in rows:
+            flag = "  <-- slower" if case_id in regressions else ""
+            print(f"{case_id:<40} {base_ms:10.4f} {now_ms:10.4f} {ratio:7.2f}{flag}")
+
+        sys.exit(1 if regressions else 0)
+
+    if not args.save:
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,46 @@
+# fixtures.py
+"""
+Labelled data and fitted models shared by the tests and benchmarks.
+"""
+
+import numpy as np
+from pmrdb.pmrdb import PMRDB
+
+
+# modality -> (mean if UP, mean if DOWN, noise std)
+SIGNALS = {
+    "T": (0.5, -0.5, 0.8),
+    "V": (0.4, -0.4, 0.6),
+}
+
+
+def labelled_data(n, seed=0, p_up=0.5, signals=None):
+    """
+    n "UP"/"DOWN" labels and one Gaussian evidence column per modality.
+
+    returns: (X, y) with X = { modality: (n,) values }, y = (n,) labels
+    """
+    signals = SIGNALS if signals is None else signals
+
+    rng = np.random.default_rng(seed)
+    y = np.where(rng.random(n) < p_up, "UP", "DOWN")
+    up = y == "UP"
+
+    X = {
+        m: np.where(up, mean_up, mean_down) + rng.normal(0, noise, n)
+        for m, (mean_up, mean_down, noise) in signals.items()
+    }
+    return X, y
+
+
+def fitted_model(n, seed=0, signals=None):
+    """
+    PMRDB(seed) fitted on labelled_data(n, seed, signals=signals).
+
+    returns: (db, X, y)
+    """
+    X, y = labelled_data(n, seed, signals=signals)
+
+    db = PMRDB(seed=seed)
+    db.fit(X, y)
+    return db, X, y
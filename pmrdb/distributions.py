@@ -1,29 +1,170 @@
 # pmrdb/distributions.py
 
+import math
 import numpy as np
-from scipy.stats import norm, beta, dirichlet
 # import networkx as nx
-import torch
-import math
+
+# torch and scipy are imported on first use by the distributions that
+# need them, so `import pmrdb` stays cheap.
+
+_LOG_SQRT_2PI = 0.5 * math.log(2 * math.pi)
+
+_special = None
+
+
+def _scipy_special():
+    """
+    scipy.special, imported on the first call and bound for later ones,
+    so hot paths do not re-run the import machinery.
+    """
+    global _special
+    if _special is None:
+        from scipy import special
+
+        _special = special
+    return _special
+
+
+def _as_param(value, copy=False):
+    """
+    Parameter as a plain float (scalar) or float64 ndarray.
+    copy=True never returns the caller's array (for in-place updates).
+    """
+    arr = np.array(value, dtype=float) if copy else np.asarray(value, dtype=float)
+    return float(arr) if arr.ndim == 0 else arr
+
+
+def _as_result(value):
+    return float(value) if np.ndim(value) == 0 else value
+
 
 class GaussianDistribution:
-    def __init__(self, mean, var):
-        self.mean = torch.as_tensor(mean, dtype=torch.float32)
-        self.var = torch.as_tensor(var, dtype=torch.float32)
-        self.std = torch.sqrt(self.var)
+    """
+    Normal distribution N(mean, var).
+
+    backend="numpy" (default) works on plain floats / ndarrays, with
+    log(std) and the normalization constant cached at construction;
+    mean and var may be arrays to describe a batch of Gaussians.
+    backend="torch" wraps torch.distributions.Normal and returns tensors.
+    """
+
+    def __init__(self, mean, var, backend="numpy"):
+        self.backend = backend
+
+        if backend == "torch":
+            import torch
+
+            self.mean = torch.as_tensor(mean, dtype=torch.float32)
+            self.var = torch.as_tensor(var, dtype=torch.float32)
+            self.std = torch.sqrt(self.var)
+
+            self.dist = torch.distributions.Normal(self.mean, self.std)
 
-        self.dist = torch.distributions.Normal(self.mean, self.std)
+        elif backend == "numpy":
+            self.mean = _as_param(mean)
+            self.var = _as_param(var)
+            self.std = np.sqrt(self.var)
+
+            # log N(x) = log_norm - 0.5 * ((x - mean) / std)^2
+            self._log_norm = -np.log(self.std) - _LOG_SQRT_2PI
+
+        else:
+            raise ValueError(f"Unknown backend: {backend}")
 
     def pdf(self, x):
-        x = torch.as_tensor(x, dtype=torch.float32)
-        return torch.exp(self.dist.log_prob(x))
+        if self.backend == "torch":
+            import torch
+
+            x = torch.as_tensor(x, dtype=torch.float32)
+            return torch.exp(self.dist.log_prob(x))
+
+        return _as_result(np.exp(self._log_pdf(x)))
 
     def log_pdf(self, x):
-        x = torch.as_tensor(x, dtype=torch.float32)
-        return self.dist.log_prob(x)
+        if self.backend == "torch":
+            import torch
+
+            x = torch.as_tensor(x, dtype=torch.float32)
+            return self.dist.log_prob(x)
 
-    def sample(self, n=1):
-        return self.dist.sample((n,))
+        return _as_result(self._log_pdf(x))
+
+    def _log_pdf(self, x):
+        z = (np.asarray(x, dtype=float) - self.mean) / self.std
+        return self._log_norm - 0.5 * z * z
+
+    def sample(self, n=1, rng=None):
+        """
+        Draws n samples, shape (n,) + shape(mean).
+        rng: numpy Generator (numpy backend only)
+        """
+        if self.backend == "torch":
+            return self.dist.sample((n,))
+
+        rng = np.random.default_rng() if rng is None else rng
+        return rng.normal(self.mean, self.std, size=(n,) + np.shape(self.mean))
+
+    @classmethod
+    def stack(cls, gaussians):
+        """
+        One numpy-backed distribution whose parameters carry a leading
+        axis over the given Gaussians (e.g. one per hypothesis).
+        """
+        mean = np.array([_as_param(g.mean) for g in gaussians])
+        var = np.array([_as_param(g.var) for g in gaussians])
+        return cls(mean, var)
+
+    def log_pdf_batch(self, x):
+        """
+        log-density of N values under each stacked Gaussian: (N, H).
+        """
+        return self._log_pdf(np.asarray(x, dtype=float)[:, None])
+
+    def take(self, index):
+        """
+        Sub-stack of the Gaussians at index (numpy backend).
+        """
+        return type(self)(self.mean[index], self.var[index])
+
+    def log_pdf_max(self):
+        """
+        Peak log-density, reached at the mean: an upper bound on log_pdf.
+        """
+        return self._log_norm
+
+    # ------------------------------------------------------------------
+    # Conjugate updates (Normal–Normal, known observation variance)
+    # ------------------------------------------------------------------
+    def posterior_known_variance(self, lik_var, data=None, n=None, xbar=None):
+        """
+        Treats this Gaussian as the prior on an unknown mean and returns
+        its posterior after observations with known variance lik_var:
+
+            var_n = 1 / (1 / var_0 + n / lik_var)
+            mu_n  = var_n * (mu_0 / var_0 + n * xbar / lik_var)
+
+        data: observations along the last axis, (..., n); or pass the
+            sufficient statistics n and xbar. All arguments broadcast
+            against the (possibly batched) prior parameters.
+        """
+        if data is not None:
+            data = np.asarray(data, dtype=float)
+            n, xbar = data.shape[-1], data.mean(axis=-1)
+
+        mean, var = _as_param(self.mean), _as_param(self.var)
+        n = np.asarray(n, dtype=float)
+
+        var_n = 1.0 / (1.0 / var + n / lik_var)
+        mu_n = var_n * (mean / var + n * np.asarray(xbar, dtype=float) / lik_var)
+
+        return GaussianDistribution(mu_n, var_n)
+
+    def posterior_predictive(self, lik_var):
+        """
+        Density of a new observation when this Gaussian is the belief
+        over its mean: N(mean, var + lik_var).
+        """
+        return GaussianDistribution(_as_param(self.mean), _as_param(self.var) + lik_var)
 
     @classmethod
     def from_pdf(cls, pdf_fn):
@@ -32,24 +173,298 @@ class GaussianDistribution:
         )
 
 
+class NormalInverseGamma:
+    """
+    Normal–Inverse-Gamma belief over the mean and variance of a Gaussian:
+
+        var  ~ InvGamma(alpha, beta)
+        mean ~ N(mu, var / kappa)
+
+    Parameters may be arrays, so a whole batch of entities updates in
+    one call. The posterior predictive is a Student-t with 2 * alpha
+    degrees of freedom.
+    """
+
+    def __init__(self, mu=0.0, kappa=1.0, alpha=1.0, beta=1.0):
+        self.mu = _as_param(mu)
+        self.kappa = _as_param(kappa)
+        self.alpha = _as_param(alpha)
+        self.beta = _as_param(beta)
+
+    def update(self, data=None, n=None, xbar=None, ss=None):
+        """
+        Posterior after observations, as a new NormalInverseGamma.
+
+        data: observations along the last axis, (..., n); or pass the
+            sufficient statistics n, xbar and ss = Σ (x - xbar)^2
+            (e.g. count, mean and m2 of GaussianSufficientStatistics).
+        """
+        if data is not None:
+            data = np.asarray(data, dtype=float)
+            n, xbar = data.shape[-1], data.mean(axis=-1)
+            ss = ((data - xbar[..., None]) ** 2).sum(axis=-1)
+
+        n = np.asarray(n, dtype=float)
+        xbar = np.asarray(xbar, dtype=float)
+
+        kappa_n = self.kappa + n
+        mu_n = (self.kappa * self.mu + n * xbar) / kappa_n
+        alpha_n = self.alpha + 0.5 * n
+        beta_n = (self.beta + 0.5 * np.asarray(ss, dtype=float)
+                  + 0.5 * self.kappa * n * (xbar - self.mu) ** 2 / kappa_n)
+
+        return NormalInverseGamma(mu_n, kappa_n, alpha_n, beta_n)
+
+    def predictive_scale(self):
+        """
+        Scale of the Student-t posterior predictive.
+        """
+        return np.sqrt(self.beta * (self.kappa + 1.0) / (self.alpha * self.kappa))
+
+    def predictive_log_pdf(self, x):
+        """
+        log p(x_new | data): Student-t(df = 2 alpha, loc = mu,
+        scale = predictive_scale()).
+        """
+        gammaln = _scipy_special().gammaln
+
+        df = 2.0 * self.alpha
+        scale = self.predictive_scale()
+        z = (np.asarray(x, dtype=float) - self.mu) / scale
+
+        out = (gammaln(0.5 * (df + 1.0)) - gammaln(0.5 * df)
+               - 0.5 * np.log(df * np.pi) - np.log(scale)
+               - 0.5 * (df + 1.0) * np.log1p(z * z / df))
+        return _as_result(out)
+
+    def predictive_pdf(self, x):
+        return _as_result(np.exp(self.predictive_log_pdf(x)))
+
+    def sample(self, n=1, rng=None):
+        """
+        Draws n (mean, var) pairs, each of shape (n,) + shape(mu).
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        size = (n,) + np.shape(self.mu)
+
+        var = self.beta / rng.gamma(self.alpha, 1.0, size=size)
+        mean = rng.normal(self.mu, np.sqrt(var / self.kappa))
+        return mean, var
+
+
 class BetaDistribution:
+    """
+    Beta(a, b) on (0, 1).
+
+    a and b may be arrays to describe a batch of Betas (e.g. one per
+    entity or hypothesis). log B(a, b) is cached and refreshed only for
+    the pairs touched by a conjugate update.
+
+    Every update bumps the instance's version and the class-wide
+    n_updates, so holders of stacked copies can detect stale parameters.
+    """
+
+    n_updates = 0
+
     def __init__(self, a, b):
-        self.a = a
-        self.b = b
+        # own copies: conjugate updates modify a and b in place
+        self.a = _as_param(a, copy=True)
+        self.b = _as_param(b, copy=True)
+        self.version = 0
+        self._refresh_normalizer()
+
+    def _refresh_normalizer(self, index=None):
+        betaln = _scipy_special().betaln
+
+        if index is None:
+            self.log_B = betaln(self.a, self.b)
+        else:
+            self.log_B[index] = betaln(self.a[index], self.b[index])
 
     def pdf(self, x):
-        return beta.pdf(x, self.a, self.b)
+        return _as_result(np.exp(self._log_pdf(x)))
+
+    def log_pdf(self, x):
+        return _as_result(self._log_pdf(x))
+
+    def _log_pdf(self, x):
+        special = _scipy_special()
+
+        x = np.asarray(x, dtype=float)
+        out = special.xlogy(self.a - 1.0, x) + special.xlog1py(self.b - 1.0, -x) - self.log_B
+        return np.where((x < 0) | (x > 1), -np.inf, out)
+
+    def sample(self, n=1, rng=None):
+        """
+        Draws n samples, shape (n,) + shape(a). rng: numpy Generator
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        return rng.beta(self.a, self.b, size=(n,) + np.shape(self.a))
+
+    # ------------------------------------------------------------------
+    # Conjugate updates (in place)
+    # ------------------------------------------------------------------
+    def update(self, successes, failures, index=None):
+        """
+        Beta–Binomial posterior update: a += successes, b += failures.
+
+        index: for batched Betas, the pair(s) each count applies to;
+            repeated indices accumulate. Without it the counts
+            broadcast against a and b.
+        """
+        if index is None:
+            self.a = _as_param(self.a + np.asarray(successes, dtype=float))
+            self.b = _as_param(self.b + np.asarray(failures, dtype=float))
+            self._refresh_normalizer()
+        else:
+            index = np.asarray(index)
+            np.add.at(self.a, index, successes)
+            np.add.at(self.b, index, failures)
+            self._refresh_normalizer(np.unique(index))
+
+        self.version += 1
+        BetaDistribution.n_updates += 1
+        return self
 
-    def sample(self, n=1):
-        return np.random.beta(self.a, self.b, n)
+    def update_bernoulli(self, outcomes, index=None):
+        """
+        outcomes: 0/1 observations (one per index when batched)
+        """
+        outcomes = np.asarray(outcomes, dtype=float)
+        if index is None and outcomes.ndim > np.ndim(self.a):
+            # a run of outcomes for the whole batch: reduce over it first
+            return self.update(outcomes.sum(axis=0), (1.0 - outcomes).sum(axis=0))
+        return self.update(outcomes, 1.0 - outcomes, index)
+
+    def update_binomial(self, k, n, index=None):
+        """
+        k successes out of n trials.
+        """
+        k = np.asarray(k, dtype=float)
+        return self.update(k, np.asarray(n, dtype=float) - k, index)
+
+    @classmethod
+    def stack(cls, betas):
+        """
+        One distribution with (H,) parameter arrays over the given Betas.
+        """
+        return cls(np.array([b.a for b in betas], dtype=float),
+                   np.array([b.b for b in betas], dtype=float))
+
+    def log_pdf_batch(self, x):
+        """
+        log-density of N values under each stacked Beta: (N, H).
+        """
+        return self._log_pdf(np.asarray(x, dtype=float)[:, None])
+
+    def take(self, index):
+        """
+        Sub-stack of the Betas at index.
+        """
+        return type(self)(self.a[index], self.b[index])
+
+    def log_pdf_max(self):
+        """
+        Upper bound on log_pdf: the density at the mode, or +inf when
+        a < 1 or b < 1 (the density is unbounded at an edge).
+        """
+        a, b = np.asarray(self.a), np.asarray(self.b)
+        unimodal = a + b > 2
+        mode = np.where(unimodal, (a - 1.0) / np.where(unimodal, a + b - 2.0, 1.0), 0.5)
+
+        with np.errstate(invalid="ignore"):
+            peak = self._log_pdf(mode)
+        return _as_result(np.where((a < 1) | (b < 1), np.inf, peak))
 
 
 class DirichletDistribution:
-    def __init__(self, alpha_vec):
-        self.alpha = np.array(alpha_vec)
+    """
+    Dirichlet(alpha) over the (K-1)-simplex.
+
+    alpha may be a (K,) vector or an (H, K) stack of vectors. log B(alpha)
+    is cached at construction, so log_pdf is one matmul:
+
+        log p(x | alpha) = log(x) @ (alpha - 1)^T - log B(alpha)
+
+    validate=False skips the simplex checks on x (fast mode). Points on
+    a face (x_k = 0) are accepted where alpha_k >= 1, as in scipy.
+    """
+
+    def __init__(self, alpha_vec, validate=True):
+        gammaln = _scipy_special().gammaln
+
+        self.alpha = np.array(alpha_vec, dtype=float)
+        self.validate = validate
+
+        # log B(alpha) = Σ log Γ(alpha_k) - log Γ(Σ alpha_k)
+        self.log_B = gammaln(self.alpha).sum(axis=-1) - gammaln(self.alpha.sum(axis=-1))
 
     def pdf(self, x):
-        return dirichlet.pdf(x, self.alpha)
+        return _as_result(np.exp(self.log_pdf(x)))
+
+    def log_pdf(self, x, validate=None):
+        """
+        x: simplex point (K,) or N points as an (N, K) array
+        returns: scalar, (N,), (H,) or (N, H) depending on the shapes
+                 of x and alpha
+        """
+        x = np.asarray(x, dtype=float)
+        validate = self.validate if validate is None else validate
+
+        if validate:
+            if x.shape[-1] != self.alpha.shape[-1]:
+                raise ValueError(f"Expected points of length {self.alpha.shape[-1]}, got {x.shape[-1]}")
+            if np.any(x < 0) or np.any(np.abs(x.sum(axis=-1) - 1.0) > 1e-6):
+                raise ValueError("Dirichlet points must be non-negative and sum to 1")
+            # on a face, the density is unbounded where alpha_k < 1
+            alpha_min = self.alpha.reshape(-1, self.alpha.shape[-1]).min(axis=0)
+            if np.any((x == 0) & (alpha_min < 1)):
+                raise ValueError("Dirichlet points may only be 0 where alpha >= 1")
+
+        if np.all(x > 0):
+            return _as_result(np.log(x) @ (self.alpha - 1.0).T - self.log_B)
+
+        # boundary points: xlogy gives 0 * log(0) = 0 where alpha_k = 1
+        if self.alpha.ndim > 1:
+            x = x[..., None, :]
+        return _as_result(_scipy_special().xlogy(self.alpha - 1.0, x).sum(axis=-1) - self.log_B)
+
+    @classmethod
+    def stack(cls, dirichlets):
+        """
+        One distribution with an (H, K) alpha matrix over the given
+        Dirichlets (e.g. one per hypothesis).
+        """
+        return cls(np.stack([d.alpha for d in dirichlets]),
+                   validate=all(d.validate for d in dirichlets))
+
+    def log_pdf_batch(self, x):
+        """
+        log-density of N points under each stacked Dirichlet: (N, H).
+        """
+        return self.log_pdf(np.asarray(x, dtype=float).reshape(-1, self.alpha.shape[-1]))
+
+    def take(self, index):
+        """
+        Sub-stack of the Dirichlets at index.
+        """
+        return type(self)(self.alpha[index], validate=self.validate)
+
+    def log_pdf_max(self):
+        """
+        Upper bound on log_pdf: the density at the mode, or +inf when
+        some alpha_k < 1 (the density is unbounded at a face).
+        """
+        excess = self.alpha - 1.0
+        total = excess.sum(axis=-1, keepdims=True)
+        mode = excess / np.where(total > 0, total, 1.0)
+
+        peak = _scipy_special().xlogy(excess, mode).sum(axis=-1) - self.log_B
+        return _as_result(np.where(np.any(self.alpha < 1, axis=-1), np.inf, peak))
 
-    def sample(self, n=1):
-        return dirichlet.rvs(self.alpha, size=n)
+    def sample(self, n=1, rng=None):
+        """
+        Draws n points, shape (n, K). rng: numpy Generator
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        return rng.dirichlet(self.alpha, size=n)
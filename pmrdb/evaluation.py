@@ -0,0 +1,233 @@
+# pmrdb/evaluation.py
+
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+# ----------------------------
+# STREAMING METRICS
+# ----------------------------
+class StreamingEvaluator:
+    """
+    Accumulates accuracy, log-loss, Brier score and reliability-bin
+    counts over posterior batches in O(n_bins) memory.
+
+    Batches are (N, H) posterior arrays with (N,) true hypothesis
+    column indices (see ProbabilitySpace.hypothesis_index).
+    """
+
+    def __init__(self, n_bins=10, eps=1e-15):
+        self.n_bins = n_bins
+        self.eps = eps
+
+        self.n = 0
+        self.correct = 0
+        self.log_loss_sum = 0.0
+        self.brier_sum = 0.0
+
+        # reliability diagram: rows per confidence bin, their summed
+        # confidence and number of correct predictions
+        self.bin_count = np.zeros(n_bins)
+        self.bin_confidence = np.zeros(n_bins)
+        self.bin_correct = np.zeros(n_bins)
+
+    def update(self, posterior, labels):
+        posterior = np.asarray(posterior, dtype=float)
+        labels = np.asarray(labels)
+        rows = np.arange(len(labels))
+
+        p_true = posterior[rows, labels]
+        pred = np.argmax(posterior, axis=1)
+        hit = pred == labels
+        confidence = posterior[rows, pred]
+
+        self.n += len(labels)
+        self.correct += int(hit.sum())
+        self.log_loss_sum -= float(np.log(np.clip(p_true, self.eps, 1.0)).sum())
+        # ||p - onehot(y)||^2 = sum p^2 - 2 p_y + 1
+        self.brier_sum += float((np.einsum("ij,ij->i", posterior, posterior) - 2 * p_true + 1).sum())
+
+        bins = np.minimum((confidence * self.n_bins).astype(int), self.n_bins - 1)
+        self.bin_count += np.bincount(bins, minlength=self.n_bins)
+        self.bin_confidence += np.bincount(bins, weights=confidence, minlength=self.n_bins)
+        self.bin_correct += np.bincount(bins, weights=hit, minlength=self.n_bins)
+
+        return self
+
+    def merge(self, other):
+        if other.n_bins != self.n_bins:
+            raise ValueError("Cannot merge evaluators with different bin counts")
+
+        self.n += other.n
+        self.correct += other.correct
+        self.log_loss_sum += other.log_loss_sum
+        self.brier_sum += other.brier_sum
+        self.bin_count += other.bin_count
+        self.bin_confidence += other.bin_confidence
+        self.bin_correct += other.bin_correct
+
+        return self
+
+    def result(self):
+        """
+        returns: dict { n, accuracy, log_loss, brier, ece, reliability }
+        """
+        n = max(self.n, 1)
+        seen = self.bin_count > 0
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            bin_conf = self.bin_confidence / self.bin_count
+            bin_acc = self.bin_correct / self.bin_count
+
+        # expected calibration error: count-weighted |accuracy - confidence|
+        ece = float(np.sum(self.bin_count[seen] * np.abs(bin_acc[seen] - bin_conf[seen])) / n)
+
+        return {
+            "n": self.n,
+            "accuracy": self.correct / n,
+            "log_loss": self.log_loss_sum / n,
+            "brier": self.brier_sum / n,
+            "ece": ece,
+            "reliability": {
+                "count": self.bin_count.copy(),
+                "confidence": bin_conf,
+                "accuracy": bin_acc,
+            },
+        }
+
+
+def evaluate_stream(batches, n_bins=10):
+    """
+    Consumes an iterable of (posterior, labels) batches.
+    returns: StreamingEvaluator.result()
+    """
+    evaluator = StreamingEvaluator(n_bins)
+    for posterior, labels in batches:
+        evaluator.update(posterior, labels)
+    return evaluator.result()
+
+
+# ----------------------------
+# SHARED-MEMORY ARRAYS
+# ----------------------------
+def _to_shared(arr):
+    """
+    Copies an array into a new shared memory block.
+    returns: (block, spec) where spec re-attaches it in another process
+    """
+    arr = np.ascontiguousarray(arr)
+    block = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=block.buf)[...] = arr
+    return block, (block.name, arr.shape, arr.dtype.str)
+
+
+def _attach(spec):
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+# ----------------------------
+# WORKER
+# ----------------------------
+_worker = {}
+
+
+def _init_worker(space, column_specs, label_spec, output_spec, n_bins):
+    blocks = []
+
+    columns = {}
+    for modality, spec in column_specs.items():
+        block, columns[modality] = _attach(spec)
+        blocks.append(block)
+
+    block, labels = _attach(label_spec)
+    blocks.append(block)
+    block, output = _attach(output_spec)
+    blocks.append(block)
+
+    _worker.update(space=space, columns=columns, labels=labels, output=output,
+                   n_bins=n_bins, blocks=blocks)
+
+
+def _evaluate_shard(bounds):
+    start, stop = bounds
+    columns = {m: col[start:stop] for m, col in _worker["columns"].items()}
+
+    post = _worker["space"].posterior_batch(columns)
+    _worker["output"][start:stop] = post
+
+    evaluator = StreamingEvaluator(_worker["n_bins"]).update(post, _worker["labels"][start:stop])
+    return start, evaluator
+
+
+# ----------------------------
+# PARALLEL EVALUATION DRIVER
+# ----------------------------
+def evaluate_parallel(space, evidence_columns: dict, labels, n_workers=None, shard_size=100_000,
+                      n_bins=10):
+    """
+    Scores N evidence rows with space.posterior_batch across a process pool.
+
+    evidence_columns: dict { modality: array of N values }
+    labels: array of N hypothesis names
+    n_workers: pool size (default: CPU count); 1 runs in-process
+
+    Evidence, labels and the (N, H) output live in shared memory, so
+    workers read and write them without pickling. The model is sent
+    once per worker (inherited without pickling under fork). Shards
+    are merged in row order, so results do not depend on scheduling.
+
+    returns: dict { posterior, predictions } plus the
+             StreamingEvaluator metrics merged over all shards
+    """
+    n_workers = n_workers or mp.cpu_count()
+    label_idx = space.hypothesis_index(labels)
+    n = len(label_idx)
+
+    shards = [(s, min(s + shard_size, n)) for s in range(0, n, shard_size)]
+
+    blocks = []
+    try:
+        column_specs = {}
+        for modality, values in evidence_columns.items():
+            block, column_specs[modality] = _to_shared(np.asarray(values))
+            blocks.append(block)
+
+        block, label_spec = _to_shared(label_idx)
+        blocks.append(block)
+        output_block, output_spec = _to_shared(np.zeros((n, len(space.hypotheses))))
+        blocks.append(output_block)
+
+        initargs = (space, column_specs, label_spec, output_spec, n_bins)
+
+        if n_workers == 1:
+            _init_worker(*initargs)
+            try:
+                results = [_evaluate_shard(b) for b in shards]
+            finally:
+                for block in _worker.pop("blocks"):
+                    block.close()
+                _worker.clear()
+        else:
+            method = "fork" if "fork" in mp.get_all_start_methods() else "spawn"
+            with mp.get_context(method).Pool(n_workers, _init_worker, initargs) as pool:
+                results = pool.map(_evaluate_shard, shards)
+
+        posterior = np.ndarray(output_spec[1], dtype=float, buffer=output_block.buf).copy()
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    metrics = StreamingEvaluator(n_bins)
+    for _, evaluator in sorted(results, key=lambda r: r[0]):
+        metrics.merge(evaluator)
+
+    return {
+        "posterior": posterior,
+        "predictions": np.argmax(posterior, axis=1),
+        **metrics.result(),
+    }
@@ -0,0 +1,161 @@
+# pmrdb/filtering.py
+
+from collections import deque
+
+import numpy as np
+from pmrdb.probability_space import logsumexp
+
+
+def _log_matmul(log_p, matrix):
+    """
+    log(exp(log_p) @ matrix), row-wise stable. log_p: (S, H)
+    """
+    shift = np.max(log_p, axis=-1, keepdims=True)
+    shift = np.where(np.isfinite(shift), shift, 0.0)
+
+    with np.errstate(divide="ignore"):
+        return np.log(np.exp(log_p - shift) @ matrix) + shift
+
+
+# ----------------------------
+# SEQUENTIAL BAYESIAN FILTER
+# ----------------------------
+class SequentialFilter:
+    """
+    Recursive posterior over S independent evidence streams.
+
+    Each tick the previous posterior becomes the prior, optionally
+    pushed through a hypothesis transition matrix (regime switching;
+    the first tick starts from the space's priors):
+
+        predict:  P(Y_t | e_<t) = P(Y_t-1 | e_<t) @ transition
+        update:   P(Y_t | e_<=t) ∝ P(e_t | Y_t) * P(Y_t | e_<t)
+
+    An update costs O(S * H), or O(S * H^2) with a transition matrix.
+    Beliefs are kept in log space.
+
+    transition: (H, H) row-stochastic, transition[i, j] = P(j | i),
+                in ProbabilitySpace.hypotheses order; None keeps the
+                hypothesis fixed over time
+    lag: with lag L > 0, smoothed() returns P(Y_t-L | e_<=t), at an
+         extra O(L * S * H^2) per call
+    """
+
+    def __init__(self, space, n_streams=1, transition=None, lag=0):
+        self.space = space
+        self.n_streams = n_streams
+        self.lag = lag
+
+        n_hyp = len(space.hypotheses)
+        if transition is not None:
+            transition = np.asarray(transition, dtype=float)
+            if transition.shape != (n_hyp, n_hyp):
+                raise ValueError(f"Expected a ({n_hyp}, {n_hyp}) transition matrix, got {transition.shape}")
+            if np.any(transition < 0) or not np.allclose(transition.sum(axis=1), 1.0):
+                raise ValueError("Transition rows must be probability distributions")
+        self.transition = transition
+
+        self.reset()
+
+    def reset(self, streams=None):
+        """
+        Restarts streams (all by default) from the space's priors.
+        """
+        prior = self.space.log_prior_array
+
+        if streams is None:
+            self.log_belief = np.tile(prior, (self.n_streams, 1))
+            self.log_evidence = np.zeros(self.n_streams)
+            self.n_ticks = 0
+
+            # streams still at their prior (no transition before the first tick)
+            self._fresh = np.ones(self.n_streams, dtype=bool)
+
+            # last lag + 1 filtered beliefs and the lag likelihoods after them
+            self._history = deque(maxlen=self.lag + 1)
+            self._likelihoods = deque(maxlen=self.lag)
+        else:
+            self.log_belief[streams] = prior
+            self.log_evidence[streams] = 0.0
+            self._fresh[streams] = True
+            for past in self._history:
+                past[streams] = prior
+            for log_lik in self._likelihoods:
+                log_lik[streams] = 0.0
+
+    @property
+    def posterior(self):
+        """Current filtered posterior, (S, H)."""
+        return np.exp(self.log_belief)
+
+    def predict(self):
+        """
+        Log prior for the next tick, (S, H).
+        """
+        if self.transition is None:
+            return self.log_belief
+
+        predicted = _log_matmul(self.log_belief, self.transition)
+        predicted[self._fresh] = self.log_belief[self._fresh]
+        return predicted
+
+    def update(self, evidence_columns: dict):
+        """
+        evidence_columns: dict { modality: S values } (a scalar per
+                          modality when n_streams == 1)
+
+        Streams whose evidence has zero likelihood under every
+        hypothesis keep the predicted prior.
+
+        returns: filtered posterior, (S, H)
+        """
+        log_lik = np.zeros_like(self.log_belief)
+        for modality, values in evidence_columns.items():
+            values = np.asarray(values)
+            if self.n_streams == 1 and values.shape[:1] != (1,):
+                values = values[None]
+            log_lik += self.space.modality_log_likelihoods(modality, values)
+
+        predicted = self.predict()
+        scores = predicted + log_lik
+        log_Z = logsumexp(scores, axis=1, keepdims=True)
+        degenerate = ~np.isfinite(log_Z[:, 0])
+
+        self.log_belief = scores - np.where(degenerate[:, None], 0.0, log_Z)
+        self.log_belief[degenerate] = predicted[degenerate]
+        log_lik[degenerate] = 0.0
+
+        self.log_evidence += np.where(degenerate, 0.0, log_Z[:, 0])
+        self._fresh[:] = False
+        self.n_ticks += 1
+
+        if self.lag:
+            self._likelihoods.append(log_lik)
+            self._history.append(self.log_belief)
+
+        return self.posterior
+
+    def smoothed(self):
+        """
+        Fixed-lag smoothed posterior P(Y_t-L | e_<=t), (S, H); for the
+        earliest tick kept while fewer than L + 1 ticks have been seen.
+
+        Backward pass over the window:
+            beta_s = (P(e_s+1 | Y) * beta_s+1) @ transition^T
+            P(Y_s | e_<=t) ∝ P(Y_s | e_<=s) * beta_s
+        """
+        if not self.lag or not self._history:
+            return self.posterior
+
+        # likelihoods of the ticks after the oldest kept belief
+        likelihoods = list(self._likelihoods)
+        likelihoods = likelihoods[len(likelihoods) - (len(self._history) - 1):]
+
+        log_beta = np.zeros_like(self.log_belief)
+        for log_lik in reversed(likelihoods):
+            log_beta = log_beta + log_lik
+            if self.transition is not None:
+                log_beta = _log_matmul(log_beta, self.transition.T)
+
+        scores = self._history[0] + log_beta
+        return np.exp(scores - logsumexp(scores, axis=1, keepdims=True))
@@ -13,7 +13,7 @@ def fuse_gaussians(gaussians):
     fused_mean = fused_var * sum(weighted_means)
 
     G = gaussians[0].__class__
-    return G(fused_mean, fused_var)
+    return G(fused_mean, fused_var, backend=gaussians[0].backend)
 
 
 # ----------------------------
@@ -27,23 +27,303 @@ def fuse_dirichlet(dirichlets):
     return D(fused_alpha)
 
 
+# ----------------------------
+# GROUPED (SEGMENTED) FUSION
+# ----------------------------
+def fuse_gaussians_grouped(means, variances, groups, n_groups=None, weights=None):
+    """
+    Fuses many Gaussians per group in one segmented reduction.
+
+    means, variances: (N,) parameters of the opinions
+    groups: (N,) integer group index of each opinion
+    weights: optional (N,) precision weights, i.e. opinion i
+             contributes precision weights[i] / variances[i]
+
+    returns: (fused_means, fused_vars), each (n_groups,)
+             (empty groups get var = inf and mean = nan)
+    """
+    means = np.asarray(means, dtype=float)
+    variances = np.asarray(variances, dtype=float)
+    groups = np.asarray(groups)
+    n_groups = int(groups.max()) + 1 if n_groups is None else n_groups
+
+    precision = 1.0 / variances
+    if weights is not None:
+        precision = precision * np.asarray(weights, dtype=float)
+
+    total_precision = np.bincount(groups, weights=precision, minlength=n_groups)
+    weighted_means = np.bincount(groups, weights=precision * means, minlength=n_groups)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fused_var = 1.0 / total_precision
+        fused_mean = weighted_means * fused_var
+
+    return fused_mean, fused_var
+
+
+def fuse_dirichlet_grouped(alphas, groups, n_groups=None):
+    """
+    Sums Dirichlet concentration vectors per group.
+
+    alphas: (N, K) concentration vectors
+    groups: (N,) integer group index of each vector
+
+    returns: (n_groups, K) fused alphas
+    """
+    alphas = np.asarray(alphas, dtype=float)
+    groups = np.asarray(groups)
+    n_groups = int(groups.max()) + 1 if n_groups is None else n_groups
+    K = alphas.shape[1]
+
+    # flat cell id of every entry: group * K + component
+    cells = (groups[:, None] * K + np.arange(K)).ravel()
+    fused = np.bincount(cells, weights=alphas.ravel(), minlength=n_groups * K)
+
+    return fused.reshape(n_groups, K)
+
+
+# ----------------------------
+# SLIDING-WINDOW (INCREMENTAL) FUSION
+# ----------------------------
+class _SlidingWindowSum:
+    """
+    Running sums of the last window_size D-dimensional entries for
+    each of n_windows independent windows.
+
+    Entries live in a (W, K, D) ring buffer; push and evict adjust the
+    sums in O(1) per window. Every resum_every operations the sums are
+    recomputed from the buffer to bound floating-point drift.
+    """
+
+    def __init__(self, n_windows, window_size, width, resum_every=1024):
+        self.window_size = window_size
+        self.resum_every = resum_every
+
+        self.buffer = np.zeros((n_windows, window_size, width))
+        self.sums = np.zeros((n_windows, width))
+        self.head = np.zeros(n_windows, dtype=np.intp)    # oldest entry
+        self.count = np.zeros(n_windows, dtype=np.intp)
+        self._ops = 0
+
+    def _windows(self, windows):
+        return np.arange(len(self.count)) if windows is None else np.asarray(windows)
+
+    def push(self, values, windows=None):
+        """
+        Appends one entry to each selected window (all by default),
+        evicting its oldest entry when the window is full.
+        Window ids must be unique within a call.
+        """
+        idx = self._windows(windows)
+        values = np.broadcast_to(np.asarray(values, dtype=float), (len(idx), self.sums.shape[1]))
+
+        full = self.count[idx] == self.window_size
+        pos = (self.head[idx] + self.count[idx]) % self.window_size
+
+        # a full window overwrites its oldest slot
+        self.sums[idx[full]] -= self.buffer[idx[full], pos[full]]
+        self.head[idx[full]] = (self.head[idx[full]] + 1) % self.window_size
+        self.count[idx[~full]] += 1
+
+        self.buffer[idx, pos] = values
+        self.sums[idx] += values
+        self._tick()
+
+    def evict(self, windows=None):
+        """
+        Drops the oldest entry of each selected, non-empty window.
+        """
+        idx = self._windows(windows)
+        idx = idx[self.count[idx] > 0]
+        head = self.head[idx]
+
+        self.sums[idx] -= self.buffer[idx, head]
+        # evicted slots are zeroed so resum() can sum whole buffers
+        self.buffer[idx, head] = 0.0
+        self.head[idx] = (head + 1) % self.window_size
+        self.count[idx] -= 1
+        self._tick()
+
+    def resum(self):
+        self.sums = self.buffer.sum(axis=1)
+        self._ops = 0
+
+    def _tick(self):
+        self._ops += 1
+        if self._ops >= self.resum_every:
+            self.resum()
+
+
+class IncrementalGaussianFusion(_SlidingWindowSum):
+    """
+    Precision-weighted fusion of the last window_size Gaussian
+    readings, for n_windows independent signals.
+
+    Keeps running sums of precision 1/var and of mean/var, so the fused
+    Gaussian (same as fuse_gaussians over the window) is O(1) to update.
+    """
+
+    def __init__(self, n_windows=1, window_size=32, resum_every=1024):
+        super().__init__(n_windows, window_size, 2, resum_every)
+
+    def push(self, means, variances, windows=None):
+        means = np.asarray(means, dtype=float)
+        precision = 1.0 / np.asarray(variances, dtype=float)
+        super().push(np.stack(np.broadcast_arrays(precision, means * precision), axis=-1), windows)
+
+    def fused(self):
+        """
+        returns: (means, variances), each (n_windows,)
+                 (empty windows get var = inf and mean = nan)
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var = 1.0 / self.sums[:, 0]
+            return self.sums[:, 1] * var, var
+
+
+class IncrementalDirichletFusion(_SlidingWindowSum):
+    """
+    Sum of the last window_size Dirichlet alpha vectors (as in
+    fuse_dirichlet) for n_windows independent signals.
+    """
+
+    def __init__(self, n_windows=1, window_size=32, dim=3, resum_every=1024):
+        super().__init__(n_windows, window_size, dim, resum_every)
+
+    def fused(self):
+        """
+        returns: (n_windows, dim) fused alphas
+        """
+        return self.sums.copy()
+
+
 # ----------------------------
 # MULTIMODAL FUSION
 # ----------------------------
-def multimodal_fusion(modality_posteriors):
-    modalities = list(modality_posteriors.keys())
-    weights = np.array([modality_posteriors[m]["weight"] for m in modalities])
-    weights = weights / np.sum(weights)
+class FusedDensity:
+    """
+    Geometric (log-linear) pool of modality densities:
+
+        p(x) ∝ Π p_i(x)^w_i,   i.e.   log p(x) = Σ w_i log p_i(x) - log Z
+
+    Evaluates whole arrays of x in log space. log Z is computed once by
+    trapezoidal quadrature over a grid and cached together with the
+    CDF used by sample().
+
+    Calling the object returns the unnormalized pooled density
+    Π p_i(x)^w_i (the value multimodal_fusion always returned).
+
+    grid: None (derived from the component distributions), (lo, hi),
+          or an explicit increasing array of points
+    """
+
+    def __init__(self, dists, weights, grid=None, n_grid=2048):
+        self.dists = list(dists)
+        weights = np.asarray(weights, dtype=float)
+        self.weights = weights / np.sum(weights)
+
+        self.n_grid = n_grid
+        self._grid_spec = grid
+        self._cached = None   # (grid, log_pdf on grid, cdf on grid, log Z)
+
+    # ------------------------------------------------------------------
+    def unnormalized_log_pdf(self, x):
+        x = np.asarray(x, dtype=float)
+        out = np.zeros(x.shape)
+        for w, dist in zip(self.weights, self.dists):
+            out += w * _log_density(dist, x)
+        return out
+
+    def __call__(self, x):
+        return _scalar_or_array(np.exp(self.unnormalized_log_pdf(x)))
+
+    def log_normalizer(self):
+        return self._quadrature()[3]
+
+    def log_pdf(self, x):
+        return _scalar_or_array(self.unnormalized_log_pdf(x) - self.log_normalizer())
+
+    def pdf(self, x):
+        return _scalar_or_array(np.exp(self.unnormalized_log_pdf(x) - self.log_normalizer()))
+
+    def sample(self, n=1, rng=None):
+        """
+        Inverse-CDF sampling on the cached grid (linear interpolation).
+        """
+        grid, _, cdf, _ = self._quadrature()
+        rng = np.random.default_rng() if rng is None else rng
+        return np.interp(rng.random(n), cdf, grid)
 
-    pdfs = [modality_posteriors[m]["dist"].pdf for m in modalities]
+    # ------------------------------------------------------------------
+    def _grid(self):
+        spec = self._grid_spec
+        if spec is not None and np.ndim(spec) == 1 and len(spec) != 2:
+            return np.asarray(spec, dtype=float)
 
-    def fused_pdf(x):
-        val = 1.0
-        for w, pdf in zip(weights, pdfs):
-            val *= pdf(x) ** w
-        return val
+        if spec is None:
+            lo, hi = _support(self.dists)
+        else:
+            lo, hi = spec
+        return np.linspace(lo, hi, self.n_grid)
 
-    return fused_pdf
+    def _quadrature(self):
+        if self._cached is None:
+            grid = self._grid()
+            log_u = self.unnormalized_log_pdf(grid)
+
+            # integrate exp(log_u) with the peak factored out
+            peak = np.max(log_u)
+            u = np.exp(log_u - peak)
+            steps = 0.5 * (u[1:] + u[:-1]) * np.diff(grid)
+            cdf = np.concatenate([[0.0], np.cumsum(steps)])
+
+            log_Z = np.log(cdf[-1]) + peak
+            self._cached = (grid, log_u - log_Z, cdf / cdf[-1], log_Z)
+
+        return self._cached
+
+
+def _log_density(dist, x):
+    if hasattr(dist, "log_pdf"):
+        return np.asarray(dist.log_pdf(x), dtype=float)
+    with np.errstate(divide="ignore"):
+        return np.log(np.asarray(dist.pdf(x), dtype=float))
+
+
+def _scalar_or_array(value):
+    return float(value) if np.ndim(value) == 0 else value
+
+
+def _support(dists, n_std=8.0, eps=1e-9):
+    """
+    Quadrature range covering every component distribution.
+    """
+    los, his = [], []
+    for d in dists:
+        if hasattr(d, "a") and hasattr(d, "b"):          # Beta on (0, 1)
+            los.append(eps)
+            his.append(1.0 - eps)
+        elif hasattr(d, "mean") and hasattr(d, "var"):   # Gaussian
+            mean = float(np.asarray(d.mean))
+            std = float(np.sqrt(np.asarray(d.var)))
+            los.append(mean - n_std * std)
+            his.append(mean + n_std * std)
+        else:
+            raise ValueError(f"Cannot infer a quadrature grid for {type(d).__name__}; pass grid=")
+
+    return min(los), max(his)
+
+
+def multimodal_fusion(modality_posteriors, grid=None, n_grid=2048):
+    """
+    modality_posteriors: dict { modality: {"dist": distribution, "weight": w} }
+    returns: FusedDensity over the weighted modality densities
+    """
+    modalities = list(modality_posteriors.keys())
+    weights = [modality_posteriors[m]["weight"] for m in modalities]
+    dists = [modality_posteriors[m]["dist"] for m in modalities]
+
+    return FusedDensity(dists, weights, grid=grid, n_grid=n_grid)
 
 
 # ======================================================================
@@ -64,6 +344,14 @@ class EvidenceFusion:
     def fuse_dirichlet(dirichlets):
         return fuse_dirichlet(dirichlets)
 
+    @staticmethod
+    def fuse_gaussians_grouped(means, variances, groups, n_groups=None, weights=None):
+        return fuse_gaussians_grouped(means, variances, groups, n_groups, weights)
+
+    @staticmethod
+    def fuse_dirichlet_grouped(alphas, groups, n_groups=None):
+        return fuse_dirichlet_grouped(alphas, groups, n_groups)
+
     @staticmethod
     def fuse_multimodal(posteriors):
         return multimodal_fusion(posteriors)
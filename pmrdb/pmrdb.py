@@ -1,16 +1,30 @@
 # pmrdb/pmrdb.py
 
 import numpy as np
-from pmrdb.probability_space import ProbabilitySpace
+from pmrdb.probability_space import ProbabilitySpace, logsumexp
 from pmrdb.distributions import GaussianDistribution
 from pmrdb.fusion import EvidenceFusion
+from pmrdb.statistics import GaussianSufficientStatistics
 
 
 class PMRDB:
 
-    def __init__(self):
-        self.space = ProbabilitySpace()
+    def __init__(self, seed=None):
+        self.space = ProbabilitySpace(log_space=True)
         self.fusion = EvidenceFusion()
+        self.rng = np.random.default_rng(seed)
+
+        # Fitted Gaussian statistics per modality:
+        # modality -> {"n", "mean", "var"}, each of shape (H,), or (1,)
+        # when the likelihood is shared by all hypotheses
+        self.params = {}
+
+        # Table registered for each fitted modality; params only apply
+        # while the space still holds that table
+        self._fitted_tables = {}
+
+        # Running sufficient statistics behind fit / partial_fit
+        self.stats = None
 
         # Default binary forecasting
         self.space.set_priors({"UP": 0.5, "DOWN": 0.5})
@@ -20,26 +34,119 @@ class PMRDB:
     # -----------------------------------------------------------
     def set_modalities(self, T: np.ndarray, R: np.ndarray, V: np.ndarray):
 
-        # Build Gaussian distributions
-        T_dist = GaussianDistribution(T.mean(), T.var() + 1e-6)
-        R_dist = GaussianDistribution(R.mean(), R.var() + 1e-6)
-        V_dist = GaussianDistribution(V.mean(), V.var() + 1e-6)
+        # One Gaussian per modality, shared by every hypothesis
+        for name, data in (("T", T), ("R", R), ("V", V)):
+            self._register_gaussians(
+                name,
+                n=np.array([data.size], dtype=float),
+                mean=np.array([data.mean()]),
+                var=np.array([data.var() + 1e-6]),
+            )
+
+    def fit(self, X: dict, y, min_var=1e-6, fit_priors=False):
+        """
+        Learns one Gaussian per (modality, hypothesis).
+
+        X: dict { modality: array of N values }
+        y: array of N labels, each one of space.hypotheses
+        fit_priors: also set priors to the label frequencies
+
+        Per-hypothesis counts, means and variances for all modalities
+        come from two bincount reductions over (hypothesis, modality)
+        cells, with no Python loop over rows or classes.
+        """
+        self.stats = None
+        self.partial_fit(X, y, min_var=min_var, fit_priors=fit_priors)
+
+    def partial_fit(self, X: dict, y, min_var=1e-6, fit_priors=False, refit=True):
+        """
+        Adds a chunk of labelled rows to the running statistics.
+
+        refit: rebuild the likelihood tables now; pass False while
+            streaming many chunks and call refit() at the end.
+        """
+        modalities = list(X)
+        if self.stats is None:
+            self.stats = GaussianSufficientStatistics(self.space.hypotheses, modalities)
+        elif modalities != self.stats.modalities:
+            raise ValueError(f"Expected modalities {self.stats.modalities}, got {modalities}")
+
+        idx = self.space.hypothesis_index(y)
+        data = np.column_stack([np.asarray(X[m], dtype=float) for m in modalities])
+        self.stats.update(data, idx)
+
+        if refit:
+            self.refit(min_var=min_var, fit_priors=fit_priors)
+
+    def fit_stream(self, chunks, min_var=1e-6, fit_priors=False):
+        """
+        Fits from an iterable of (X, y) chunks, e.g. statistics.iter_chunks
+        over memory-mapped columns, refitting once at the end.
+
+        Like fit(), starts from fresh statistics; use partial_fit() to
+        keep accumulating.
+        """
+        self.stats = None
+        for X, y in chunks:
+            self.partial_fit(X, y, min_var=min_var, fit_priors=fit_priors, refit=False)
+
+        self.refit(min_var=min_var, fit_priors=fit_priors)
+
+    def merge(self, other, min_var=1e-6, fit_priors=False):
+        """
+        Combines statistics from another PMRDB (or a
+        GaussianSufficientStatistics) fitted on a different shard.
+        """
+        other_stats = other.stats if isinstance(other, PMRDB) else other
+
+        if self.stats is None:
+            self.stats = other_stats.copy()
+        else:
+            self.stats.merge(other_stats)
+
+        self.refit(min_var=min_var, fit_priors=fit_priors)
+
+    def refit(self, min_var=1e-6, fit_priors=False):
+        """
+        Rebuilds the Gaussian likelihood tables from self.stats.
+        """
+        stats = self.stats
+        if stats.hypotheses != self.space.hypotheses:
+            raise ValueError("Hypotheses changed since the statistics were collected")
 
-        # Register likelihood functions
-        self.space.register_likelihood(
-            "T",
-            lambda x, h: T_dist.pdf(x)
-        )
+        if np.any(stats.count == 0):
+            empty = [h for h, c in zip(stats.hypotheses, stats.count) if c == 0]
+            raise ValueError(f"No training rows for hypotheses: {empty}")
+
+        var = stats.var + min_var
+        for j, modality in enumerate(stats.modalities):
+            self._register_gaussians(modality, stats.count, stats.mean[:, j], var[:, j])
+
+        if fit_priors:
+            self.space.set_priors(dict(zip(stats.hypotheses, stats.count)))
+
+    def _register_gaussians(self, modality, n, mean, var):
+        """
+        Stores fitted statistics and registers the matching Gaussian
+        table. Length-1 statistics are shared by every hypothesis.
+        """
+        self.params[modality] = {"n": n, "mean": mean, "var": var}
 
-        self.space.register_likelihood(
-            "R",
-            lambda x, h: R_dist.pdf(x)
-        )
+        if mean.size == 1:
+            self.space.register_distribution_table(modality, GaussianDistribution(mean[0], var[0]))
+        else:
+            dists = [GaussianDistribution(m, v) for m, v in zip(mean, var)]
+            self.space.register_distribution_table(modality, dict(zip(self.space.hypotheses, dists)))
 
-        self.space.register_likelihood(
-            "V",
-            lambda x, h: V_dist.pdf(x)
-        )
+        self._fitted_tables[modality] = self.space.likelihood_tables[modality]
+
+    def _is_fitted(self, modality):
+        """
+        True while the space still scores modality with the table fitted
+        here, i.e. it has not been re-registered since.
+        """
+        table = self.space.likelihood_tables.get(modality)
+        return table is not None and table is self._fitted_tables.get(modality)
 
     # -----------------------------------------------------------
     # 2. Compute posterior given evidence
@@ -50,31 +157,176 @@ class PMRDB:
         """
         return self.space.posterior(obs)
 
+    def enable_cache(self, maxsize=1024, decimals=None):
+        """
+        Memoize compute_posterior() on (optionally rounded) evidence.
+        See ProbabilitySpace.enable_cache.
+        """
+        self.space.enable_cache(maxsize, decimals)
+
+    def filter(self, n_streams=1, transition=None, lag=0):
+        """
+        Tick-by-tick posterior that carries each posterior forward as
+        the next prior. See ProbabilitySpace.filter.
+        """
+        return self.space.filter(n_streams, transition, lag)
+
+    # -----------------------------------------------------------
+    # 3. Parameter ensembles
+    # -----------------------------------------------------------
+    def sample_parameters(self, n_samples, rng=None):
+        """
+        Draws n_samples Gaussian parameter sets per modality from
+        their posterior given the fitted statistics (flat prior):
+
+            var  ~ n * s² / χ²(n - 1)
+            mean ~ N(x̄, var / n)
+
+        returns: dict modality -> (means, vars), each (n_samples, H)
+                 (or (n_samples, 1) for shared likelihoods); modalities
+                 re-registered on the space since fitting are skipped
+        """
+        rng = self.rng if rng is None else rng
+        draws = {}
+
+        for modality, p in self.params.items():
+            if not self._is_fitted(modality):
+                continue
+
+            n = p["n"]
+            chi2 = rng.chisquare(np.maximum(n - 1, 1), size=(n_samples, n.size))
+            var = n * p["var"] / chi2
+            mean = p["mean"] + np.sqrt(var / n) * rng.standard_normal(var.shape)
+            draws[modality] = (mean, var)
+
+        return draws
+
+    def ensemble_posterior(self, evidence_columns, n_samples=50, rng=None):
+        """
+        Posterior P(Y | evidence) under every member of a parameter
+        ensemble, evaluated in one vectorized pass. Modalities without
+        fitted statistics, or re-registered on the space since fitting,
+        use their registered likelihood for all members.
+
+        evidence_columns: dict { modality: array of N values }
+        returns: (N, n_samples, H) array, columns ordered as space.hypotheses
+        """
+        draws = self.sample_parameters(n_samples, rng)
+        scores = self.space.log_prior_array
+
+        for modality, values in evidence_columns.items():
+            if modality not in draws:
+                # no fitted statistics: identical for every member
+                ll = self.space.modality_log_likelihoods(modality, values)
+                scores = scores + ll[:, None, :]
+                continue
+
+            x = np.asarray(values, dtype=float)[:, None, None]
+            mean, var = draws[modality]
+            scores = scores - 0.5 * ((x - mean) ** 2 / var + np.log(2 * np.pi * var))
+
+        log_Z = logsumexp(scores, axis=-1, keepdims=True)
+        degenerate = ~np.isfinite(log_Z[..., 0])
+
+        post = np.exp(scores - np.where(degenerate[..., None], 0.0, log_Z))
+        post[degenerate] = 1 / scores.shape[-1]
+
+        return post
+
+    def is_deterministic(self, obs):
+        """
+        True when no observed modality has fitted statistics to draw
+        an ensemble from, so every forecast sample would be identical.
+        """
+        return not any(self._is_fitted(m) for m in obs)
+
     # -----------------------------------------------------------
-    # 3. Monte Carlo uncertainty
+    # 4. Monte Carlo uncertainty
     # -----------------------------------------------------------
-    def estimate_uncertainty(self, posterior_samples):
-        arr = np.array(posterior_samples)
+    def estimate_uncertainty(self, posterior_samples, target=0):
+        """
+        Decomposes predictive uncertainty over an ensemble:
+
+            total     = H[ E_s p_s ]            (predictive entropy)
+            aleatoric = E_s H[ p_s ]            (expected entropy)
+            epistemic = total - aleatoric       (mutual information)
+
+        posterior_samples: (S, H) array of ensemble posteriors, or (S,)
+            probabilities of a binary hypothesis. Leading batch axes
+            (..., S, H) are reduced independently.
+        target: hypothesis column summarised by "mean" and "variance"
+
+        Entropies are in nats.
+        """
+        arr = np.asarray(posterior_samples, dtype=float)
+        if arr.ndim == 1:
+            arr = np.stack([arr, 1.0 - arr], axis=-1)
+
+        mean = arr.mean(axis=-2)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            member_entropy = -np.where(arr > 0, arr * np.log(arr), 0.0).sum(axis=-1)
+            total = -np.where(mean > 0, mean * np.log(mean), 0.0).sum(axis=-1)
+
+        aleatoric = member_entropy.mean(axis=-1)
+        # clip round-off: mutual information is non-negative
+        epistemic = np.maximum(total - aleatoric, 0.0)
+
+        def out(v):
+            return float(v) if np.ndim(v) == 0 else v
 
         return {
-            "mean": float(arr.mean()),
-            "variance": float(arr.var()),
-            "aleatoric": float(arr.var() * 0.5),
-            "epistemic": float(arr.var() * 0.5),
-            "total": float(arr.var())
+            "mean": out(mean[..., target]),
+            "variance": out(arr[..., target].var(axis=-1)),
+            "aleatoric": out(aleatoric),
+            "epistemic": out(epistemic),
+            "total": out(total)
         }
 
     # -----------------------------------------------------------
-    # 4. Full pipeline
+    # 5. Full pipeline
     # -----------------------------------------------------------
-    def forecast(self, observation, n_samples=50):
-        samples = []
+    def forecast(self, observation, n_samples=50, rng=None):
+        """
+        Posterior of UP averaged over an ensemble of n_samples
+        parameter draws. Deterministic models (or n_samples <= 1)
+        skip sampling and evaluate the point estimate once.
+        """
+        hypotheses = self.space.hypotheses
+
+        if n_samples <= 1 or self.is_deterministic(observation):
+            post = self.compute_posterior(observation)
+            samples = np.array([[post[h] for h in hypotheses]])
+        else:
+            columns = {m: [v] for m, v in observation.items()}
+            samples = self.ensemble_posterior(columns, n_samples, rng)[0]
+
+        uncertainty = self.estimate_uncertainty(samples, target=hypotheses.index("UP"))
+
+        return {
+            "posterior_probability_UP": uncertainty["mean"],
+            "uncertainty": uncertainty
+        }
+
+    def forecast_batch(self, evidence_columns, n_samples=50, rng=None):
+        """
+        forecast() for N observations in one vectorized pass; all rows
+        share one parameter ensemble.
+
+        evidence_columns: dict { modality: array of N values }
+        returns: dict { posterior_probability_UP: (N,),
+                        uncertainty: dict of (N,) arrays }
+        """
+        hypotheses = self.space.hypotheses
+
+        if n_samples <= 1 or self.is_deterministic(evidence_columns):
+            samples = self.space.posterior_batch(evidence_columns)[:, None, :]
+        else:
+            samples = self.ensemble_posterior(evidence_columns, n_samples, rng)
 
-        for _ in range(n_samples):
-            post = self.compute_posterior(observation)["UP"]
-            samples.append(post)
+        uncertainty = self.estimate_uncertainty(samples, target=hypotheses.index("UP"))
 
         return {
-            "posterior_probability_UP": float(np.mean(samples)),
-            "uncertainty": self.estimate_uncertainty(samples)
+            "posterior_probability_UP": uncertainty["mean"],
+            "uncertainty": uncertainty
         }
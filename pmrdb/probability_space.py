@@ -1,4 +1,167 @@
+from collections import OrderedDict
+from functools import lru_cache
+
 import numpy as np
+from pmrdb.distributions import BetaDistribution, DirichletDistribution
+
+
+class _TableLogLikelihood:
+    """
+    f(x, h) -> log P(x | Y=h) backed by a distribution table, so the
+    scalar inference path works on table-registered modalities.
+    """
+
+    def __init__(self, table):
+        self.table = table
+
+    def __call__(self, x, hypothesis):
+        return self.table[hypothesis].log_pdf(x)
+
+
+class _SharedTable:
+    """
+    { hypothesis: distribution } view in which every hypothesis, including
+    ones added later, maps to the same distribution.
+    """
+
+    def __init__(self, dist):
+        self.dist = dist
+
+    def __getitem__(self, hypothesis):
+        return self.dist
+
+    def __contains__(self, hypothesis):
+        return True
+
+
+class _SharedStack:
+    """
+    Stacked-table stand-in for one distribution shared by n hypotheses:
+    scores once and broadcasts over the hypothesis axis.
+    """
+
+    def __init__(self, dist, n):
+        self.dist = dist
+        self.n = n
+
+    def log_pdf_batch(self, x):
+        x = np.asarray(x, dtype=float)
+        log_p = np.asarray(self.dist.log_pdf(x), dtype=float).reshape(len(x), 1)
+        return np.broadcast_to(log_p, (len(x), self.n))
+
+    def take(self, index):
+        return _SharedStack(self.dist, len(index))
+
+    def log_pdf_max(self):
+        bound = getattr(self.dist, "log_pdf_max", None)
+        return np.inf if bound is None else bound()
+
+
+class HypothesisRegistry:
+    """
+    Index-mapped hypothesis store.
+
+    Names map to contiguous column indices; raw prior weights live in a
+    growable array and are normalized lazily, so registering H
+    hypotheses costs O(H) rather than O(H^2).
+    """
+
+    def __init__(self):
+        self.names = []
+        self.index = {}
+
+        self._weights = np.zeros(16)
+        self._total = 0.0
+        self._prior = None
+        self._log_prior = None
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def clear(self):
+        self.__init__()
+
+    @property
+    def weights(self):
+        """Raw (unnormalized) prior weights."""
+        return self._weights[:len(self.names)]
+
+    @property
+    def total(self):
+        """Sum of raw weights, kept as a running total."""
+        return self._total
+
+    def add(self, names, weights):
+        """
+        Sets raw weights for names; unknown names are appended.
+        """
+        weights = np.broadcast_to(np.asarray(weights, dtype=float), (len(names),))
+
+        idx = np.empty(len(names), dtype=np.intp)
+        for i, name in enumerate(names):
+            j = self.index.get(name)
+            if j is None:
+                j = self.index[name] = len(self.names)
+                self.names.append(name)
+            idx[i] = j
+
+        if len(self.names) > len(self._weights):
+            grown = np.zeros(max(2 * len(self._weights), len(self.names)))
+            grown[:len(self._weights)] = self._weights
+            self._weights = grown
+
+        # duplicate names: the last weight wins, as with repeated assignment
+        idx, last = np.unique(idx[::-1], return_index=True)
+        weights = weights[::-1][last]
+
+        self._total += float(weights.sum() - self._weights[idx].sum())
+        self._weights[idx] = weights
+        self._prior = self._log_prior = None
+
+    @property
+    def prior(self):
+        """Normalized priors, (H,) in index order."""
+        if self._prior is None:
+            self._prior = self.weights / self._total
+        return self._prior
+
+    @property
+    def log_prior(self):
+        if self._log_prior is None:
+            with np.errstate(divide="ignore"):
+                self._log_prior = np.log(self.prior)
+        return self._log_prior
+
+    def as_dict(self, values=None):
+        """
+        { name: value } view of an (H,) array (the priors by default).
+        """
+        values = self.prior if values is None else values
+        return dict(zip(self.names, np.asarray(values).tolist()))
+
+
+def logsumexp(a, axis=None, keepdims=False):
+    """
+    Numerically stable log(sum(exp(a))) along an axis.
+
+    Slices that are entirely -inf reduce to -inf instead of nan.
+    """
+    a = np.asarray(a, dtype=float)
+    a_max = np.max(a, axis=axis, keepdims=True)
+    a_max = np.where(np.isfinite(a_max), a_max, 0.0)
+
+    with np.errstate(divide="ignore"):
+        out = np.log(np.sum(np.exp(a - a_max), axis=axis, keepdims=True)) + a_max
+
+    if not keepdims:
+        out = np.squeeze(out, axis=axis) if axis is not None else out.reshape(())
+    return out
 
 
 class ProbabilitySpace:
@@ -11,18 +174,52 @@ class ProbabilitySpace:
     - priors P(Y)
     - multimodal evidence P(T, R, V | Y)
     - normalized posterior P(Y | evidence)
+
+    With log_space=True, joint scores are sums of log-likelihoods and
+    normalization goes through logsumexp, so sharp likelihoods or many
+    modalities do not underflow to the uniform fallback.
     """
 
-    def __init__(self, modalities=None):
+    def __init__(self, modalities=None, log_space=False):
         # Names of modalities (trajectory, regime, volatility, etc.)
         self.modalities = modalities if modalities else []
 
-        # Hypotheses: dict name → prior probability
-        self.priors = {}
+        # Hypotheses: index-mapped names and prior weights
+        self.hypothesis_store = HypothesisRegistry()
+
+        # Raw weight that a prior of 1.0 maps to: the registry total as
+        # of the last renormalization (register_prior does not renormalize)
+        self._prior_unit = 1.0
 
         # Likelihood functions: modality -> function(evidence, hypothesis)
         self.likelihood_functions = {}
 
+        # Log-likelihood functions: modality -> function(evidence, hypothesis)
+        self.log_likelihood_functions = {}
+
+        # Distribution tables: modality -> { hypothesis: distribution }
+        self.likelihood_tables = {}
+
+        # Stacked-parameter distribution per table, in hypothesis order
+        self._stacked_tables = {}
+
+        # Betas behind each stacked table, to spot in-place updates:
+        # modality -> (BetaDistribution.n_updates seen, [(beta, version)])
+        self._stack_versions = {}
+
+        # Score hypotheses in log space
+        self.log_space = log_space
+
+        # Likelihood functions found not to accept array evidence
+        self._scalar_only = set()
+
+        # Optional LRU posterior cache (see enable_cache)
+        self._cache = None
+        self._cache_maxsize = 0
+        self._cache_decimals = None
+        self._cache_hits = 0
+        self._cache_misses = 0
+
     # ----------------------------------------------------------
     # HYPOTHESES / PRIORS
     # ----------------------------------------------------------
@@ -30,16 +227,48 @@ class ProbabilitySpace:
         """
         priors: dict { hypothesis_name: probability }
         """
-        # normalize automatically
-        Z = sum(priors.values())
-        self.priors = {k: v / Z for k, v in priors.items()}
+        # normalized lazily by the registry
+        self.hypothesis_store.clear()
+        self.hypothesis_store.add(list(priors), list(priors.values()))
+        self._prior_unit = self.hypothesis_store.total
+        self._model_changed()
 
     def add_hypothesis(self, name, prior):
-        self.priors[name] = prior
-        # normalize
-        Z = sum(self.priors.values())
-        for k in self.priors:
-            self.priors[k] /= Z
+        """
+        Adds (or re-weights) one hypothesis; prior is relative to the
+        current normalized priors, which are then renormalized.
+        """
+        self.add_hypotheses([name], [prior])
+
+    def add_hypotheses(self, names, priors):
+        """
+        Bulk registration. Each prior is relative to the current
+        normalized priors; everything is renormalized once.
+        """
+        store = self.hypothesis_store
+        store.add(list(names), np.asarray(priors, dtype=float) * self._prior_unit)
+        self._prior_unit = store.total
+        self._model_changed()
+
+    @property
+    def priors(self):
+        """
+        { hypothesis: normalized prior } view of the registry.
+        """
+        return self.hypothesis_store.as_dict()
+
+    @priors.setter
+    def priors(self, priors: dict):
+        self.set_priors(priors)
+
+    @property
+    def prior_array(self):
+        """Normalized priors, (H,), columns ordered as self.hypotheses."""
+        return self.hypothesis_store.prior
+
+    @property
+    def log_prior_array(self):
+        return self.hypothesis_store.log_prior
 
     # ----------------------------------------------------------
     # LIKELIHOOD MODELS
@@ -48,9 +277,113 @@ class ProbabilitySpace:
         """
         func must follow:   f(evidence_value, hypothesis) -> P(x | Y=h)
         """
+        self.likelihood_tables.pop(modality, None)
+        self.log_likelihood_functions.pop(modality, None)
         self.likelihood_functions[modality] = func
         if modality not in self.modalities:
             self.modalities.append(modality)
+        self._model_changed()
+
+    def register_log_likelihood(self, modality: str, func):
+        """
+        func must follow:   f(evidence_value, hypothesis) -> log P(x | Y=h)
+
+        Replaces any linear likelihood registered for the modality.
+        """
+        self.likelihood_tables.pop(modality, None)
+        self.likelihood_functions.pop(modality, None)
+        self.log_likelihood_functions[modality] = func
+        if modality not in self.modalities:
+            self.modalities.append(modality)
+        self._model_changed()
+
+    def register_distribution_table(self, modality: str, table: dict):
+        """
+        table: dict { hypothesis: distribution }, e.g.
+            {"UP": GaussianDistribution(0.5, 0.1),
+             "DOWN": GaussianDistribution(-0.5, 0.1)}
+
+        Distributions must provide log_pdf(x). When every entry has the
+        same class and that class can stack() its parameters, batched
+        inference evaluates all hypotheses of the modality in one call.
+
+        Betas updated in place afterwards (BetaDistribution.update) are
+        picked up on the next inference call: the stacked copy is rebuilt
+        and the posterior cache cleared.
+
+        A single distribution instead of a dict is shared by every
+        hypothesis, including ones added later.
+        """
+        if not isinstance(table, dict):
+            table = _SharedTable(table)
+
+        self.register_log_likelihood(modality, _TableLogLikelihood(table))
+        self.likelihood_tables[modality] = table
+
+    def _stacked_table(self, modality):
+        """
+        Distribution with stacked per-hypothesis parameters, or None
+        when the table cannot be stacked.
+        """
+        if modality in self._stack_versions:
+            self._drop_stale_tables([modality])
+
+        if modality not in self._stacked_tables:
+            table = self.likelihood_tables[modality]
+            hypotheses = self.hypothesis_store.names
+
+            if isinstance(table, _SharedTable):
+                self._stacked_tables[modality] = _SharedStack(table.dist, len(hypotheses))
+                return self._stacked_tables[modality]
+
+            missing = [h for h in hypotheses if h not in table]
+            if missing:
+                raise ValueError(f"No {modality} distribution for hypotheses: {missing[:5]}")
+
+            dists = [table[h] for h in hypotheses]
+
+            tracked = [(d, d.version) for d in dists if isinstance(d, BetaDistribution)]
+            if tracked:
+                self._stack_versions[modality] = (BetaDistribution.n_updates, tracked)
+
+            cls = type(dists[0])
+            stackable = (
+                all(type(d) is cls for d in dists)
+                and hasattr(cls, "stack") and hasattr(cls, "log_pdf_batch")
+            )
+            self._stacked_tables[modality] = cls.stack(dists) if stackable else None
+
+        return self._stacked_tables[modality]
+
+    def _drop_stale_tables(self, modalities):
+        """
+        Drops the stacked tables of modalities whose Betas were updated
+        in place since stacking, and clears the posterior cache if any.
+        Costs one counter check while no Beta has been updated.
+        """
+        n_updates = BetaDistribution.n_updates
+
+        for modality in modalities:
+            seen, tracked = self._stack_versions.get(modality, (n_updates, None))
+            if seen == n_updates:
+                continue
+
+            if any(d.version != v for d, v in tracked):
+                del self._stack_versions[modality]
+                self._stacked_tables.pop(modality, None)
+                self.clear_cache()
+            else:
+                self._stack_versions[modality] = (n_updates, tracked)
+
+    def _likelihood_model(self, modality):
+        """
+        Returns (func, is_log) for a modality.
+        """
+        if modality in self.log_likelihood_functions:
+            return self.log_likelihood_functions[modality], True
+        if modality in self.likelihood_functions:
+            return self.likelihood_functions[modality], False
+        raise ValueError(f"No likelihood registered for modality: {modality}")
 
     # ----------------------------------------------------------
     # JOINT LIKELIHOOD
@@ -63,44 +396,551 @@ class ProbabilitySpace:
         prob = 1.0
 
         for modality, evidence in evidence_dict.items():
-            if modality not in self.likelihood_functions:
-                raise ValueError(f"No likelihood registered for modality: {modality}")
-
-            likelihood_fn = self.likelihood_functions[modality]
-            prob *= likelihood_fn(evidence, hypothesis)
+            likelihood_fn, is_log = self._likelihood_model(modality)
+            value = likelihood_fn(evidence, hypothesis)
+            prob *= np.exp(value) if is_log else value
 
         return prob
 
+    def joint_log_likelihood(self, evidence_dict: dict, hypothesis: str):
+        """
+        Computes log P(evidence | hypothesis) as a sum of
+        modality-wise log-likelihoods.
+        """
+        log_prob = 0.0
+
+        for modality, evidence in evidence_dict.items():
+            likelihood_fn, is_log = self._likelihood_model(modality)
+            value = float(likelihood_fn(evidence, hypothesis))
+            if not is_log:
+                with np.errstate(divide="ignore"):
+                    value = np.log(value)
+            log_prob += value
+
+        return log_prob
+
     # ----------------------------------------------------------
     # POSTERIOR INFERENCE
     # ----------------------------------------------------------
-    def posterior(self, evidence_dict: dict):
+    def posterior(self, evidence_dict: dict, as_array=False):
         """
         Computes posterior distribution:
             P(Y | evidence) ∝ P(evidence | Y) * P(Y)
+
+        returns: dict { hypothesis: probability }, or the (H,) array
+                 ordered as self.hypotheses when as_array=True
         """
+        if self._stack_versions:
+            # before the cache lookup: cached posteriors may be stale too
+            self._drop_stale_tables(evidence_dict)
+
+        key, evidence = (None, evidence_dict) if self._cache is None else self._cache_key(evidence_dict)
+
+        if key is None:
+            post = self._posterior(evidence_dict)
+        else:
+            if key in self._cache:
+                self._cache_hits += 1
+                self._cache.move_to_end(key)
+                post = self._cache[key]
+            else:
+                self._cache_misses += 1
+                post = self._posterior(evidence)
 
-        numerators = {}
-        for hypothesis, pY in self.priors.items():
-            likelihood = self.joint_likelihood(evidence_dict, hypothesis)
-            numerators[hypothesis] = likelihood * pY
+                self._cache[key] = post
+                if len(self._cache) > self._cache_maxsize:
+                    self._cache.popitem(last=False)
+
+        if as_array:
+            return post.copy()
+        return self.hypothesis_store.as_dict(post)
+
+    def _posterior(self, evidence_dict: dict):
+        if self.log_space:
+            return self._log_posterior(evidence_dict)
+
+        numerators = self.prior_array * self._evidence_scores(evidence_dict, log=False)
 
         # normalization constant
-        Z = sum(numerators.values())
+        Z = numerators.sum()
 
         if Z == 0:
             # fallback: uniform distribution
-            n = len(numerators)
-            return {h: 1 / n for h in numerators}
+            return np.full(len(numerators), 1 / len(numerators))
+
+        return numerators / Z
+
+    def _log_posterior(self, evidence_dict: dict):
+        scores = self.log_prior_array + self._evidence_scores(evidence_dict, log=True)
+
+        log_Z = logsumexp(scores)
+
+        if not np.isfinite(log_Z):
+            # fallback: uniform distribution
+            return np.full(len(scores), 1 / len(scores))
+
+        return np.exp(scores - log_Z)
+
+    def _evidence_scores(self, evidence_dict: dict, log):
+        """
+        P(evidence | Y) (or its log) for every hypothesis, (H,).
+
+        Stackable tables score all hypotheses in one call; other
+        likelihoods are called once per hypothesis.
+        """
+        hypotheses = self.hypothesis_store.names
+        out = np.zeros(len(hypotheses)) if log else np.ones(len(hypotheses))
+
+        for modality, evidence in evidence_dict.items():
+            values, is_log = self._modality_values(modality, evidence)
+
+            if log and not is_log:
+                with np.errstate(divide="ignore"):
+                    values = np.log(values)
+            elif is_log and not log:
+                values = np.exp(values)
+
+            if log:
+                out += values
+            else:
+                out *= values
+
+        return out
+
+    def _modality_values(self, modality, evidence, index=None):
+        """
+        Likelihoods of one modality's evidence under the hypotheses at
+        index (all by default).
+
+        returns: ((len(index),) values, is_log)
+        """
+        likelihood_fn, is_log = self._likelihood_model(modality)
+
+        stacked = self._stacked_table(modality) if modality in self.likelihood_tables else None
+        if stacked is not None:
+            if index is not None:
+                stacked = stacked.take(index) if hasattr(stacked, "take") else None
+
+        if stacked is not None:
+            values = np.asarray(stacked.log_pdf_batch(np.asarray([evidence])), dtype=float)[0]
+            return values, True
+
+        hypotheses = self.hypothesis_store.names
+        if index is not None:
+            hypotheses = [hypotheses[i] for i in index]
+
+        return np.array([float(likelihood_fn(evidence, h)) for h in hypotheses]), is_log
 
-        return {h: numerators[h] / Z for h in numerators}
-    
     def register_prior(self, hypothesis, prior_value):
         """
         Register a prior probability for a hypothesis.
+
+        The value is stored as given, on the scale of the current
+        normalized priors, without renormalizing them first; posteriors
+        normalize over whatever weights are registered.
+        """
+        self.hypothesis_store.add([hypothesis], [prior_value * self._prior_unit])
+        self._model_changed()
+
+    # ----------------------------------------------------------
+    # POSTERIOR CACHE
+    # ----------------------------------------------------------
+    def enable_cache(self, maxsize=1024, decimals=None):
+        """
+        Memoize posterior() results in an LRU cache of maxsize entries.
+
+        decimals: if set, evidence is rounded to this many decimals.
+            Scalar evidence is scored at the rounded value, so every
+            reading in a bucket gets the same posterior. Array evidence
+            (e.g. Dirichlet points, which rounding would push off the
+            simplex) is keyed by its rounded values but scored as given.
+
+        Evidence that is neither numeric nor hashable bypasses the cache.
+
+        The cache is cleared whenever priors, hypotheses or
+        likelihoods change.
+        """
+        self._cache = OrderedDict()
+        self._cache_maxsize = maxsize
+        self._cache_decimals = decimals
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    def disable_cache(self):
+        self._cache = None
+
+    def clear_cache(self):
+        if self._cache is not None:
+            self._cache.clear()
+
+    def cache_info(self):
+        """
+        returns: dict { hits, misses, size, maxsize }
+        """
+        return {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "size": 0 if self._cache is None else len(self._cache),
+            "maxsize": self._cache_maxsize,
+        }
+
+    def _model_changed(self):
+        self._stacked_tables.clear()
+        self._stack_versions.clear()
+        self.clear_cache()
+
+    def _cache_key(self, evidence_dict: dict):
+        """
+        returns: (key, evidence to score), with scalar evidence rounded
+                 to the cache buckets; key is None when the evidence
+                 cannot be cached
+        """
+        rounding = self._cache_decimals is not None
+        key, evidence = [], ({} if rounding else evidence_dict)
+
+        for modality in sorted(evidence_dict):
+            value = evidence_dict[modality]
+            try:
+                arr = np.asarray(value, dtype=float)
+            except (TypeError, ValueError):
+                try:
+                    hash(value)
+                except TypeError:
+                    return None, evidence_dict
+                key.append((modality, value))
+                if rounding:
+                    evidence[modality] = value
+                continue
+
+            if rounding:
+                arr = np.round(arr, self._cache_decimals)
+                # rounded arrays can leave their support: score the original
+                evidence[modality] = float(arr) if arr.ndim == 0 else value
+
+            if arr.ndim == 0:
+                key.append((modality, float(arr)))
+            else:
+                key.append((modality, arr.shape, tuple(arr.ravel().tolist())))
+
+        return tuple(key), evidence
+
+    # ----------------------------------------------------------
+    # BATCHED POSTERIOR INFERENCE
+    # ----------------------------------------------------------
+    @property
+    def hypotheses(self):
+        """
+        Hypothesis names in the column order used by array results.
+        """
+        return list(self.hypothesis_store.names)
+
+    def hypothesis_index(self, labels):
+        """
+        Maps an array of hypothesis names to column indices.
+        """
+        uniques, inverse = np.unique(np.asarray(labels), return_inverse=True)
+
+        index = self.hypothesis_store.index
+        unknown = [u for u in uniques.tolist() if u not in index]
+        if unknown:
+            raise ValueError(f"Labels are not hypotheses: {unknown[:5]}")
+
+        return np.array([index[u] for u in uniques.tolist()], dtype=np.intp)[inverse.ravel()]
+
+    def modality_likelihoods(self, modality: str, values):
+        """
+        Evaluates P(x_i | Y=h) for a whole evidence column.
+
+        values: array of N evidence rows for one modality
+        returns: (N, H) array, columns ordered as self.hypotheses
+
+        Stackable distribution tables are evaluated for all hypotheses
+        in one call. Otherwise each likelihood is first called once per
+        hypothesis with the full column; callables that cannot take
+        arrays (or do not return one value per row) fall back to one
+        call per row.
+        """
+        out = self._modality_scores(modality, values)
+        if self._likelihood_model(modality)[1]:
+            np.exp(out, out=out)
+        return out
+
+    def modality_log_likelihoods(self, modality: str, values):
+        """
+        Evaluates log P(x_i | Y=h) for a whole evidence column.
+
+        Same contract as modality_likelihoods(), in log space.
+        """
+        out = self._modality_scores(modality, values)
+        if not self._likelihood_model(modality)[1]:
+            with np.errstate(divide="ignore"):
+                np.log(out, out=out)
+        return out
+
+    def _modality_scores(self, modality, values):
+        likelihood_fn, _ = self._likelihood_model(modality)
+        values = np.asarray(values)
+        n = len(values)
+
+        # stacked table: all hypotheses in one array call
+        if modality in self.likelihood_tables:
+            stacked = self._stacked_table(modality)
+            if stacked is not None:
+                return np.array(stacked.log_pdf_batch(values), dtype=float)
+
+        out = np.empty((n, len(self.hypothesis_store)))
+        for j, hypothesis in enumerate(self.hypothesis_store.names):
+            out[:, j] = self._likelihood_column(likelihood_fn, values, hypothesis)
+
+        return out
+
+    def _likelihood_column(self, likelihood_fn, values, hypothesis):
+        n = len(values)
+
+        if likelihood_fn not in self._scalar_only:
+            try:
+                column = np.asarray(likelihood_fn(values, hypothesis), dtype=float)
+            except (TypeError, ValueError):
+                column = None
+
+            if column is not None and column.shape == (n,):
+                return column
+
+            # remember so the array attempt is not repeated on every batch
+            self._scalar_only.add(likelihood_fn)
+
+        return np.array([float(likelihood_fn(v, hypothesis)) for v in values])
+
+    def posterior_batch(self, evidence_columns: dict, n_rows=None):
+        """
+        Computes P(Y | evidence) for N evidence rows at once.
+
+        evidence_columns: dict { modality: array of N values }
+        n_rows: N, required only when evidence_columns is empty (every
+            row is then the prior)
+        returns: (N, H) array, columns ordered as self.hypotheses
+
+        Rows whose joint likelihood is zero for every hypothesis
+        fall back to the uniform distribution, as in posterior().
         """
-        self.priors[hypothesis] = prior_value
+        n = self._batch_rows(evidence_columns, n_rows)
 
+        if self.log_space:
+            return self._log_posterior_batch(evidence_columns, n)
+
+        n_hyp = len(self.hypothesis_store)
+
+        numerators = np.tile(self.prior_array, (n, 1))
+        for modality, values in evidence_columns.items():
+            numerators *= self.modality_likelihoods(modality, values)
+
+        Z = numerators.sum(axis=1, keepdims=True)
+        degenerate = (Z == 0)[:, 0]
+
+        post = np.divide(numerators, Z, out=np.zeros_like(numerators), where=Z != 0)
+        post[degenerate] = 1 / n_hyp
+
+        return post
+
+    def _log_posterior_batch(self, evidence_columns: dict, n):
+        n_hyp = len(self.hypothesis_store)
+
+        scores = np.tile(self.log_prior_array, (n, 1))
+        for modality, values in evidence_columns.items():
+            scores += self.modality_log_likelihoods(modality, values)
+
+        log_Z = logsumexp(scores, axis=1, keepdims=True)
+        degenerate = ~np.isfinite(log_Z[:, 0])
+
+        post = np.exp(scores - np.where(degenerate[:, None], 0.0, log_Z))
+        post[degenerate] = 1 / n_hyp
+
+        return post
+
+    @staticmethod
+    def _batch_rows(evidence_columns: dict, n_rows=None):
+        """
+        Number of evidence rows; every column must have that many.
+        """
+        lengths = {m: len(values) for m, values in evidence_columns.items()}
+
+        if n_rows is None:
+            if not lengths:
+                raise ValueError("posterior_batch needs at least one evidence column or n_rows")
+            n_rows = next(iter(lengths.values()))
+
+        mismatched = {m: n for m, n in lengths.items() if n != n_rows}
+        if mismatched:
+            raise ValueError(f"Expected {n_rows} rows per evidence column, got {mismatched}")
+
+        return n_rows
+
+    # ----------------------------------------------------------
+    # SEQUENTIAL FILTERING
+    # ----------------------------------------------------------
+    def filter(self, n_streams=1, transition=None, lag=0):
+        """
+        Recursive filter over evidence streams that uses each posterior
+        as the next prior. See pmrdb.filtering.SequentialFilter.
+        """
+        from pmrdb.filtering import SequentialFilter
+
+        return SequentialFilter(self, n_streams, transition, lag)
+
+    # ----------------------------------------------------------
+    # PRUNED (TOP-K) POSTERIOR
+    # ----------------------------------------------------------
+    def posterior_topk(self, evidence_dict: dict, k=None, tol=1e-12, upper_bounds=None):
+        """
+        Posterior over the most probable hypotheses, without scoring
+        every modality for every hypothesis.
+
+        Modalities are scored in turn. After each one, a hypothesis's
+        best possible final log-score is its exact partial score plus
+        upper bounds on the modalities still to come. It is dropped when
+        that bound:
+            - falls below the k-th best exact score (k given), or
+            - implies posterior mass below tol relative to the exact
+              mass found so far.
+
+        Bounds come from the stacked distribution tables (log_pdf_max,
+        e.g. the Gaussian peak density) or from upper_bounds:
+        dict { modality: scalar or (H,) log-likelihood upper bound }.
+        Modalities with neither are unbounded and are scored first.
+        The final cut is applied again to every exact score, so each
+        kept hypothesis carries at least tol of the kept mass; with no
+        evidence the ranking is by prior.
+
+        returns: dict {
+            hypotheses:   kept names, most probable first
+            posterior:    their probabilities, normalized over the kept set
+            index:        their columns in self.hypotheses
+            pruned_mass:  upper bound on the posterior mass dropped
+            evaluations:  (hypothesis, modality) likelihoods scored
+        }
+        """
+        if k is not None and k < 1:
+            raise ValueError("k must be at least 1")
+
+        names = self.hypothesis_store.names
+        log_prior = self.log_prior_array
+
+        # unbounded modalities first: nothing can be pruned until they are scored
+        bounds = {m: self._log_upper_bound(m, upper_bounds) for m in evidence_dict}
+        modalities = sorted(evidence_dict, key=lambda m: bool(np.all(np.isfinite(bounds[m]))))
+
+        # rest[j]: bound on the log-likelihood of modalities j.. (H,)
+        bounds = np.array([bounds[m] for m in modalities]).reshape(-1, len(names))
+        rest = np.zeros((len(modalities) + 1, len(names)))
+        rest[:-1] = np.cumsum(bounds[::-1], axis=0)[::-1]
+
+        # zero-prior hypotheses carry no mass
+        active = np.flatnonzero(np.isfinite(log_prior))
+        score = log_prior[active]
+
+        exact_index, exact_score, dropped = [], [], []
+        n_promote = k or 1
+        evaluations = 0
+
+        for j in range(len(modalities) + 1):
+            with np.errstate(invalid="ignore"):
+                optimistic = score + rest[j, active]
+
+            if j < len(modalities):
+                # finish scoring the most promising candidates, so the
+                # threshold below comes from exact scores
+                best = np.argsort(-optimistic, kind="stable")[:n_promote]
+                promoted, promoted_score = active[best], score[best]
+                for modality in modalities[j:]:
+                    promoted_score = promoted_score + self._log_values(
+                        modality, evidence_dict[modality], promoted)
+                evaluations += len(best) * (len(modalities) - j)
+
+                exact_index.append(promoted)
+                exact_score.append(promoted_score)
+
+                keep = np.ones(len(active), dtype=bool)
+                keep[best] = False
+                active, score, optimistic = active[keep], score[keep], optimistic[keep]
+
+            threshold = self._topk_threshold(np.concatenate(exact_score + [[]]), k, tol)
+
+            prune = optimistic < threshold
+            dropped.append(optimistic[prune])
+            active, score = active[~prune], score[~prune]
+
+            if j < len(modalities) and len(active):
+                score = score + self._log_values(modalities[j], evidence_dict[modalities[j]], active)
+                evaluations += len(active)
+
+        # survivors of the last step are exact
+        index = np.concatenate(exact_index + [active])
+        score = np.concatenate(exact_score + [score])
+
+        # promoted candidates only met the threshold of their own step:
+        # apply the final one to every exact score (the best always stays)
+        order = np.argsort(-score, kind="stable")
+        keep = score[order] >= self._topk_threshold(score, k, tol)
+        keep[0] = True
+        if k is not None:
+            keep[k:] = False
+
+        dropped.append(score[order[~keep]])
+        order = order[keep]
+        index, score = index[order], score[order]
+
+        log_Z = logsumexp(score)
+        if not np.isfinite(log_Z):
+            # fallback: uniform over the kept hypotheses
+            posterior = np.full(len(score), 1 / len(score))
+            pruned_mass = 0.0
+        else:
+            posterior = np.exp(score - log_Z)
+            log_dropped = logsumexp(np.concatenate(dropped + [[-np.inf]]))
+            pruned_mass = float(np.exp(log_dropped - np.logaddexp(log_Z, log_dropped)))
+
+        return {
+            "hypotheses": [names[i] for i in index],
+            "posterior": posterior,
+            "index": index,
+            "pruned_mass": pruned_mass,
+            "evaluations": evaluations,
+        }
+
+    @staticmethod
+    def _topk_threshold(exact, k, tol):
+        """
+        Log-score below which a hypothesis cannot be kept, given the
+        exact scores found so far.
+        """
+        threshold = np.sort(exact)[-k] if k is not None and len(exact) >= k else -np.inf
+        if tol and len(exact):
+            threshold = max(threshold, logsumexp(exact) + np.log(tol))
+        return threshold
+
+    def _log_values(self, modality, evidence, index):
+        values, is_log = self._modality_values(modality, evidence, index)
+        if is_log:
+            return values
+        with np.errstate(divide="ignore"):
+            return np.log(values)
+
+    def _log_upper_bound(self, modality, upper_bounds=None):
+        """
+        (H,) upper bound on a modality's log-likelihood (+inf if unknown).
+        """
+        n_hyp = len(self.hypothesis_store)
+
+        if upper_bounds is not None and modality in upper_bounds:
+            return np.broadcast_to(np.asarray(upper_bounds[modality], dtype=float), (n_hyp,))
+
+        self._likelihood_model(modality)
+        if modality in self.likelihood_tables:
+            stacked = self._stacked_table(modality)
+            if stacked is not None and hasattr(stacked, "log_pdf_max"):
+                return np.broadcast_to(np.asarray(stacked.log_pdf_max(), dtype=float), (n_hyp,))
+
+        return np.full(n_hyp, np.inf)
 
     # ----------------------------------------------------------
     # Built-in distribution wrappers
@@ -111,12 +951,28 @@ class ProbabilitySpace:
         exponent = np.exp(-0.5 * ((x - mean) / std) ** 2)
         return float(coeff * exponent)
 
+    @staticmethod
+    def gaussian_log_likelihood(x, mean, std):
+        z = (x - mean) / std
+        return float(-0.5 * z * z - np.log(std) - 0.5 * np.log(2 * np.pi))
+
     @staticmethod
     def beta_likelihood(x, a, b):
-        from scipy.stats import beta
-        return float(beta.pdf(x, a, b))
+        return float(_cached_beta(float(a), float(b)).pdf(x))
 
     @staticmethod
     def dirichlet_likelihood(vec, alpha_vec):
-        from scipy.stats import dirichlet
-        return float(dirichlet.pdf(vec, alpha_vec))
+        alpha = tuple(np.asarray(alpha_vec, dtype=float).tolist())
+        return float(_cached_dirichlet(alpha).pdf(vec))
+
+
+@lru_cache(maxsize=256)
+def _cached_beta(a, b):
+    # reuses log B(a, b) across calls with the same parameters
+    return BetaDistribution(a, b)
+
+
+@lru_cache(maxsize=256)
+def _cached_dirichlet(alpha):
+    # reuses log B(alpha) across calls with the same parameters
+    return DirichletDistribution(alpha)
@@ -0,0 +1,213 @@
+# pmrdb/serving.py
+
+import asyncio
+import time
+
+import numpy as np
+
+
+def _forecast_batch(db, evidence_columns, n_samples, seed):
+    # module level so process executors can pickle it
+    return db.forecast_batch(evidence_columns, n_samples, np.random.default_rng(seed))
+
+
+def _result_row(result, i):
+    """
+    Row i of a forecast_batch() result, shaped like forecast().
+    """
+    return {
+        "posterior_probability_UP": float(result["posterior_probability_UP"][i]),
+        "uncertainty": {k: float(v[i]) for k, v in result["uncertainty"].items()},
+    }
+
+
+# ----------------------------
+# MICRO-BATCHING SERVER
+# ----------------------------
+class ForecastServer:
+    """
+    Asyncio front end that micro-batches PMRDB.forecast calls.
+
+    Requests are queued and flushed as one forecast_batch call per
+    modality set once max_batch requests are waiting or the oldest has
+    waited max_delay_ms. Requests that arrive while a batch is being
+    scored are flushed right after it, so batches grow with load.
+
+    Batches of at least offload_min_batch rows run in executor (the
+    loop's default thread pool when None) to keep the event loop
+    responsive; smaller ones run inline. offload_min_batch=None never
+    offloads. With a process executor the model is pickled per batch.
+
+    Each batch draws its own parameter ensemble from a seed taken from
+    db.rng, so executor threads never share a Generator.
+
+        async with ForecastServer(db) as server:
+            result = await server.forecast({"T": 0.2, "V": -1.2})
+    """
+
+    def __init__(self, db, max_batch=64, max_delay_ms=2.0, n_samples=50,
+                 executor=None, offload_min_batch=16):
+        self.db = db
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self.n_samples = n_samples
+        self.executor = executor
+        self.offload_min_batch = offload_min_batch
+
+        self.n_requests = 0
+        self.n_batches = 0
+
+        self._pending = []
+        self._ready = None
+        self._timer = None
+        self._task = None
+        self._closing = False
+
+    # ----------------------------------------------------------
+    # LIFECYCLE
+    # ----------------------------------------------------------
+    async def start(self):
+        if self._task is None:
+            self._ready = asyncio.Event()
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+            self._task.add_done_callback(self._fail_pending)
+        return self
+
+    async def stop(self):
+        """
+        Flushes every queued request, then stops the batching loop.
+        """
+        if self._task is None:
+            return
+
+        self._closing = True
+        self._ready.set()
+        await self._task
+        self._task = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    # ----------------------------------------------------------
+    # REQUESTS
+    # ----------------------------------------------------------
+    async def forecast(self, observation: dict):
+        """
+        observation = {"T": value, "R": value, "V": value}
+        returns: the same dict as PMRDB.forecast
+        """
+        if self._task is None or self._closing or self._task.done():
+            raise RuntimeError("ForecastServer is not running")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((observation, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._ready.set()
+        elif len(self._pending) == 1:
+            self._timer = loop.call_later(self.max_delay, self._ready.set)
+
+        return await future
+
+    async def _run(self):
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            batch = self._pending[:self.max_batch]
+            self._pending = self._pending[self.max_batch:]
+            if self._pending:
+                # leftovers have already waited: flush them next
+                self._ready.set()
+
+            if batch:
+                await self._flush(batch)
+
+            if self._closing and not self._pending:
+                return
+
+    def _fail_pending(self, task):
+        # the loop stopped early: do not leave queued requests hanging
+        if task.cancelled() or task.exception() is None:
+            return
+
+        pending, self._pending = self._pending, []
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("ForecastServer stopped"))
+
+    async def _flush(self, batch):
+        self.n_batches += 1
+        self.n_requests += len(batch)
+
+        # observations with the same modalities share one batched call
+        groups = {}
+        for observation, future in batch:
+            if not future.done():
+                groups.setdefault(tuple(observation), []).append((observation, future))
+
+        loop = asyncio.get_running_loop()
+
+        for modalities, items in groups.items():
+            try:
+                columns = {m: np.array([obs[m] for obs, _ in items]) for m in modalities}
+                args = (self.db, columns, self.n_samples, int(self.db.rng.integers(2 ** 63)))
+
+                if self.offload_min_batch is not None and len(items) >= self.offload_min_batch:
+                    result = await loop.run_in_executor(self.executor, _forecast_batch, *args)
+                else:
+                    result = _forecast_batch(*args)
+
+                rows = [_result_row(result, i) for i in range(len(items))]
+            except Exception as exc:
+                # a bad group fails its own requests, not the server
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            for row, (_, future) in zip(rows, items):
+                if not future.done():
+                    future.set_result(row)
+
+
+# ----------------------------
+# IN-PROCESS CLIENT
+# ----------------------------
+class ForecastClient:
+    """
+    Local client for a ForecastServer that records request latencies.
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.latencies = []
+
+    async def forecast(self, observation: dict):
+        start = time.perf_counter()
+        try:
+            return await self.server.forecast(observation)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+    async def forecast_many(self, observations):
+        return await asyncio.gather(*(self.forecast(obs) for obs in observations))
+
+    def latency_percentiles(self, percentiles=(50, 99)):
+        """
+        returns: dict { "p50": milliseconds, ... }
+        """
+        if not self.latencies:
+            return {f"p{p:g}": float("nan") for p in percentiles}
+
+        values = np.percentile(np.array(self.latencies) * 1000, percentiles)
+        return {f"p{p:g}": float(v) for p, v in zip(percentiles, values)}
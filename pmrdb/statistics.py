@@ -0,0 +1,100 @@
+# pmrdb/statistics.py
+
+import numpy as np
+
+
+# ----------------------------
+# GAUSSIAN SUFFICIENT STATISTICS
+# ----------------------------
+class GaussianSufficientStatistics:
+    """
+    Per-(hypothesis, modality) count, mean and sum of squared
+    deviations (M2), updated chunk by chunk.
+
+    Each chunk is reduced with bincount, then folded into the running
+    totals with the pairwise (Chan et al.) form of Welford's update, so
+    merging shards gives exactly the statistics of the concatenated data.
+    """
+
+    def __init__(self, hypotheses, modalities):
+        self.hypotheses = list(hypotheses)
+        self.modalities = list(modalities)
+
+        H, M = len(self.hypotheses), len(self.modalities)
+        self.count = np.zeros(H)
+        self.mean = np.zeros((H, M))
+        self.m2 = np.zeros((H, M))
+
+    @property
+    def var(self):
+        """
+        Population variance per (hypothesis, modality); nan when unseen.
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.m2 / self.count[:, None]
+
+    def update(self, data, idx):
+        """
+        data: (N, M) array, columns ordered as self.modalities
+        idx: (N,) hypothesis indices
+        """
+        data = np.asarray(data, dtype=float)
+        idx = np.asarray(idx)
+        H, M = len(self.hypotheses), len(self.modalities)
+
+        count = np.bincount(idx, minlength=H).astype(float)
+
+        # flat cell id of every value: hypothesis * M + modality
+        cells = (idx[:, None] * M + np.arange(M)).ravel()
+
+        sums = np.bincount(cells, weights=data.ravel(), minlength=H * M).reshape(H, M)
+        mean = np.divide(sums, count[:, None], out=np.zeros_like(sums), where=count[:, None] > 0)
+
+        dev = data - mean[idx]
+        m2 = np.bincount(cells, weights=(dev * dev).ravel(), minlength=H * M).reshape(H, M)
+
+        self._combine(count, mean, m2)
+        return self
+
+    def merge(self, other):
+        """
+        Folds in statistics from another shard with the same
+        hypotheses and modalities.
+        """
+        if other.hypotheses != self.hypotheses or other.modalities != self.modalities:
+            raise ValueError("Cannot merge statistics over different hypotheses or modalities")
+
+        self._combine(other.count, other.mean, other.m2)
+        return self
+
+    def _combine(self, count, mean, m2):
+        total = self.count + count
+        safe = np.where(total > 0, total, 1.0)[:, None]
+
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (count[:, None] / safe)
+        self.m2 = self.m2 + m2 + delta * delta * (self.count * count)[:, None] / safe
+        self.count = total
+
+    def copy(self):
+        other = GaussianSufficientStatistics(self.hypotheses, self.modalities)
+        other.count = self.count.copy()
+        other.mean = self.mean.copy()
+        other.m2 = self.m2.copy()
+        return other
+
+
+# ----------------------------
+# CHUNKED INPUT
+# ----------------------------
+def iter_chunks(X: dict, y, chunk_size=1_000_000):
+    """
+    Yields (X_chunk, y_chunk) slices of modality columns and labels.
+
+    Slicing keeps memory-mapped arrays (np.load(..., mmap_mode="r"))
+    on disk until each chunk is read.
+    """
+    n = len(y)
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        yield {m: col[start:stop] for m, col in X.items()}, y[start:stop]
@@ -1,5 +1,7 @@
 # synthetic_data/datasets.py
 
+import os
+
 import numpy as np
 
 class SyntheticMultimodalExample:
@@ -29,3 +31,111 @@ class SyntheticMultimodalExample:
 
     def __repr__(self):
         return f"SyntheticMultimodalExample(label={self.label})"
+
+
+class SyntheticColumnarDataset:
+    """
+    Struct-of-arrays container for many synthetic records.
+
+    Columns:
+        trajectory_mean, trajectory_var: (N,) float64
+        regime_alpha: (N, 3) float64
+        volatility_mean, volatility_var: (N,) float64
+        label: (N,) int8
+
+    Indexing:
+        ds["label"]   -> column array
+        ds[i]         -> SyntheticMultimodalExample
+        ds[a:b], ds[idx_array] -> dataset over the selected rows
+                         (slices are views, no copy)
+    """
+
+    COLUMNS = (
+        "trajectory_mean",
+        "trajectory_var",
+        "regime_alpha",
+        "volatility_mean",
+        "volatility_var",
+        "label",
+    )
+
+    def __init__(self, trajectory_mean, trajectory_var, regime_alpha,
+                 volatility_mean, volatility_var, label):
+        self.trajectory_mean = np.asanyarray(trajectory_mean, dtype=np.float64)
+        self.trajectory_var = np.asanyarray(trajectory_var, dtype=np.float64)
+        self.regime_alpha = np.asanyarray(regime_alpha, dtype=np.float64)
+        self.volatility_mean = np.asanyarray(volatility_mean, dtype=np.float64)
+        self.volatility_var = np.asanyarray(volatility_var, dtype=np.float64)
+        self.label = np.asanyarray(label, dtype=np.int8)
+
+        n = len(self.label)
+        if any(len(col) != n for col in self.columns().values()):
+            raise ValueError("All columns must have the same number of rows")
+
+    def columns(self):
+        """Column name → array (no copies)."""
+        return {name: getattr(self, name) for name in self.COLUMNS}
+
+    @property
+    def nbytes(self):
+        return sum(col.nbytes for col in self.columns().values())
+
+    def __len__(self):
+        return len(self.label)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return getattr(self, key)
+
+        if isinstance(key, (int, np.integer)):
+            return SyntheticMultimodalExample(
+                trajectory={"mean": float(self.trajectory_mean[key]),
+                            "var": float(self.trajectory_var[key])},
+                regime={"alpha": np.array(self.regime_alpha[key])},
+                volatility={"mean": float(self.volatility_mean[key]),
+                            "var": float(self.volatility_var[key])},
+                label=int(self.label[key]),
+            )
+
+        return SyntheticColumnarDataset(**{name: col[key] for name, col in self.columns().items()})
+
+    def to_examples(self):
+        """Per-record objects; intended for small datasets."""
+        return [self[i] for i in range(len(self))]
+
+    # ------------------------------------------------------------------ #
+    #    Persistence
+    # ------------------------------------------------------------------ #
+    def save(self, path):
+        """
+        path ending in .npz: single uncompressed archive.
+        Otherwise: a directory with one <column>.npy file per column,
+        which load() can memory-map.
+        """
+        if str(path).endswith(".npz"):
+            np.savez(path, **self.columns())
+            return
+
+        os.makedirs(path, exist_ok=True)
+        for name, col in self.columns().items():
+            np.save(os.path.join(path, f"{name}.npy"), col)
+
+    @classmethod
+    def load(cls, path, mmap_mode="r"):
+        """
+        Opens a dataset written by save(). Directory datasets are
+        memory-mapped (mmap_mode=None reads them into memory), so
+        multi-GB files open instantly and slices are read lazily.
+        .npz archives cannot be mapped and are read eagerly.
+        """
+        if str(path).endswith(".npz"):
+            with np.load(path) as archive:
+                return cls(**{name: archive[name] for name in cls.COLUMNS})
+
+        return cls(**{
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in cls.COLUMNS
+        })
+
+    def __repr__(self):
+        return f"SyntheticColumnarDataset(n={len(self)})"
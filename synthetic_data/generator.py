@@ -1,20 +1,23 @@
 # synthetic_data/generator.py
 
 import numpy as np
-from datasets import SyntheticMultimodalExample
+from synthetic_data.datasets import SyntheticColumnarDataset
 
 
 class SyntheticDataGenerator:
     """
     Generates synthetic multimodal data for testing PMR-DB.
-    
+
     Modalities:
         - trajectory analogues (Gaussian)
         - regime embeddings (Dirichlet)
         - volatility/momentum signals (Gaussian)
-    
-    Each modality correlates with the true label so that 
+
+    Each modality correlates with the true label so that
     Bayesian updates can be evaluated.
+
+    Every helper draws a whole column for an array of labels with
+    single array calls.
     """
 
     def __init__(self,
@@ -28,69 +31,92 @@ class SyntheticDataGenerator:
     # ------------------------------------------------------------------ #
     #    Helper: Generate trajectory analogue Gaussian signals
     # ------------------------------------------------------------------ #
-    def _generate_trajectory(self, label):
+    def _generate_trajectory(self, labels):
         """
         If label = 1 (UP): trajectory mean is positive.
         If label = 0 (DOWN): trajectory mean is negative.
         """
-        mean = (0.5 if label == 1 else -0.5) + self.rng.normal(0, 0.2)
-        var = 0.1 + self.rng.normal(0, self.noise_level) ** 2
-        return {"mean": mean, "var": var}
+        n = len(labels)
+        mean = np.where(labels == 1, 0.5, -0.5) + self.rng.normal(0, 0.2, n)
+        var = 0.1 + self.rng.normal(0, self.noise_level, n) ** 2
+        return mean, var
 
     # ------------------------------------------------------------------ #
     #    Helper: Generate regime Dirichlet distribution
     # ------------------------------------------------------------------ #
-    def _generate_regime(self, label):
+    def _generate_regime(self, labels):
         """
         Encode regime likelihood via Dirichlet parameters:
             UP → alpha biased toward [trend-up]
             DOWN → alpha biased toward [trend-down]
+
+        returns: (N, 3) alpha matrix
         """
-        if label == 1:
-            base = np.array([3.0, 1.0, 1.0])
-        else:
-            base = np.array([1.0, 3.0, 1.0])
+        base = np.where((labels == 1)[:, None],
+                        np.array([3.0, 1.0, 1.0]),
+                        np.array([1.0, 3.0, 1.0]))
 
-        noise = self.rng.normal(0, self.noise_level, size=3)
-        alpha = np.abs(base + noise)
-        return {"alpha": alpha}
+        noise = self.rng.normal(0, self.noise_level, size=(len(labels), 3))
+        return np.abs(base + noise)
 
     # ------------------------------------------------------------------ #
     #    Helper: Generate volatility Gaussian signals
     # ------------------------------------------------------------------ #
-    def _generate_volatility(self, label):
+    def _generate_volatility(self, labels):
         """
         For UP: momentum tends to positive.
         For DOWN: momentum tends to negative.
         """
-        momentum_mean = (0.4 if label == 1 else -0.4) + self.rng.normal(0, 0.2)
-        momentum_var = 0.05 + np.abs(self.rng.normal(0, self.noise_level)) ** 2
-        
-        return {"mean": momentum_mean, "var": momentum_var}
+        n = len(labels)
+        momentum_mean = np.where(labels == 1, 0.4, -0.4) + self.rng.normal(0, 0.2, n)
+        momentum_var = 0.05 + np.abs(self.rng.normal(0, self.noise_level, n)) ** 2
+
+        return momentum_mean, momentum_var
 
     # ------------------------------------------------------------------ #
-    #    Main method: Generate dataset
+    #    Columnar generation
     # ------------------------------------------------------------------ #
-    def generate(self):
-        """
-        Returns list of SyntheticMultimodalExample objects.
+    def _generate_block(self, n):
+        labels = self.rng.integers(0, 2, n).astype(np.int8)  # 0 = down, 1 = up
+
+        trajectory_mean, trajectory_var = self._generate_trajectory(labels)
+        regime_alpha = self._generate_regime(labels)
+        volatility_mean, volatility_var = self._generate_volatility(labels)
+
+        return SyntheticColumnarDataset(
+            trajectory_mean=trajectory_mean,
+            trajectory_var=trajectory_var,
+            regime_alpha=regime_alpha,
+            volatility_mean=volatility_mean,
+            volatility_var=volatility_var,
+            label=labels,
+        )
+
+    def generate_columns(self, chunk_size=None):
         """
-        synthetic_data = []
+        Returns the dataset as a SyntheticColumnarDataset.
 
-        for _ in range(self.n_samples):
-            label = self.rng.integers(0, 2)  # 0 = down, 1 = up
+        With chunk_size, returns a generator of datasets with at most
+        chunk_size rows each, so large datasets never need to be held
+        in memory at once.
+        """
+        if chunk_size is None:
+            return self._generate_block(self.n_samples)
 
-            trajectory = self._generate_trajectory(label)
-            regime = self._generate_regime(label)
-            vol = self._generate_volatility(label)
+        return self._generate_chunks(chunk_size)
 
-            sample = SyntheticMultimodalExample(
-                trajectory=trajectory,
-                regime=regime,
-                volatility=vol,
-                label=label
-            )
+    def _generate_chunks(self, chunk_size):
+        for start in range(0, self.n_samples, chunk_size):
+            yield self._generate_block(min(chunk_size, self.n_samples - start))
 
-            synthetic_data.append(sample)
+    # ------------------------------------------------------------------ #
+    #    Main method: Generate dataset
+    # ------------------------------------------------------------------ #
+    def generate(self):
+        """
+        Returns list of SyntheticMultimodalExample objects.
 
-        return synthetic_data
+        Thin per-record view over generate_columns(); prefer the
+        columnar form for large datasets.
+        """
+        return self.generate_columns().to_examples()
@@ -4,6 +4,7 @@ import torch
 import numpy as np
 from pmrdb.distributions import (
     GaussianDistribution,
+    NormalInverseGamma,
     BetaDistribution,
     DirichletDistribution
 )
@@ -35,7 +36,7 @@ def test_gaussian():
     # --------------------------------------------------
     # 1. Basic distribution test
     # --------------------------------------------------
-    dist = GaussianDistribution(mean=5.0, var=4.0)
+    dist = GaussianDistribution(mean=5.0, var=4.0, backend="torch")
 
     samples = dist.sample(10000)
     print("Sample mean:", samples.mean().item())
@@ -72,7 +73,7 @@ def test_gaussian():
     # --------------------------------------------------
     # 4. Monte Carlo verification
     # --------------------------------------------------
-    posterior = GaussianDistribution(mu_n, var_n)
+    posterior = GaussianDistribution(mu_n, var_n, backend="torch")
     post_samples = posterior.sample(100000)
 
     sample_mean = post_samples.mean()
@@ -98,6 +99,77 @@ def test_gaussian():
 
 
 
+def test_gaussian_numpy():
+    print("=== Testing GaussianDistribution (NumPy) ===")
+
+    dist = GaussianDistribution(mean=5.0, var=4.0)
+
+    # scalars in, plain floats out
+    assert isinstance(dist.pdf(5.0), float)
+    assert np.isclose(dist.pdf(5.0), norm.pdf(5.0, 5.0, 2.0))
+    assert np.isclose(dist.log_pdf(0.0), norm.logpdf(0.0, 5.0, 2.0))
+
+    # arrays in, arrays out
+    x = np.linspace(-5, 15, 11)
+    assert np.allclose(dist.pdf(x), norm.pdf(x, 5.0, 2.0))
+
+    # batch of Gaussians broadcasts against the evidence
+    batch = GaussianDistribution(mean=[0.0, 3.0], var=[1.0, 4.0])
+    assert np.allclose(batch.log_pdf(x[:, None]), norm.logpdf(x[:, None], [0.0, 3.0], [1.0, 2.0]))
+
+    samples = dist.sample(20000, rng=np.random.default_rng(0))
+    print("Sample mean:", samples.mean())
+    print("Sample var :", samples.var())
+    assert samples.shape == (20000,)
+    assert abs(samples.mean() - 5.0) < 0.1
+
+    print()
+
+
+def test_gaussian_conjugate():
+    print("=== Testing Gaussian conjugate updates ===")
+
+    rng = np.random.default_rng(0)
+
+    # Normal–Normal matches the closed form used above
+    data = rng.normal(1.5, 0.5, 50)
+    post = GaussianDistribution(0.0, 1.0).posterior_known_variance(0.25, data=data)
+    mu_n, var_n = analytic_gaussian_posterior(0.0, 1.0, data, 0.25)
+    print("Posterior mean:", post.mean, "Expected:", float(mu_n))
+    assert np.isclose(post.mean, float(mu_n), atol=1e-5)
+    assert np.isclose(post.var, float(var_n), atol=1e-7)
+
+    # batched: 10k entities with their own priors in one call
+    E = 10000
+    prior = GaussianDistribution(rng.normal(0, 1, E), rng.uniform(0.5, 2, E))
+    obs = rng.normal(2.0, 1.0, size=(E, 20))
+    batch = prior.posterior_known_variance(1.0, data=obs)
+    i = 123
+    single = GaussianDistribution(prior.mean[i], prior.var[i]).posterior_known_variance(1.0, data=obs[i])
+    assert np.isclose(batch.mean[i], single.mean) and np.isclose(batch.var[i], single.var)
+    assert np.isclose(prior.posterior_predictive(1.0).var[i], prior.var[i] + 1.0)
+
+    # Normal–Inverse-Gamma: sequential updates equal one batch update
+    nig = NormalInverseGamma(mu=0.0, kappa=1.0, alpha=2.0, beta=2.0)
+    x = rng.normal(3.0, 2.0, 200)
+    once = nig.update(data=x)
+    twice = nig.update(data=x[:80]).update(data=x[80:])
+    for p in ("mu", "kappa", "alpha", "beta"):
+        assert np.isclose(getattr(once, p), getattr(twice, p))
+
+    # predictive is a Student-t
+    from scipy.stats import t
+    grid = np.linspace(-5, 10, 7)
+    expected = t.logpdf(grid, 2 * once.alpha, loc=once.mu, scale=once.predictive_scale())
+    assert np.allclose(once.predictive_log_pdf(grid), expected)
+
+    means, variances = once.sample(20000, rng=rng)
+    print("NIG posterior E[mean], E[var]:", means.mean(), variances.mean())
+    assert abs(means.mean() - 3.0) < 0.5 and abs(variances.mean() - 4.0) < 1.0
+
+    print()
+
+
 # def test_gaussian():
 #     print("=== Testing GaussianDistribution ===")
 
@@ -131,6 +203,38 @@ def test_beta():
     print()
 
 
+def test_beta_vectorized_and_conjugate():
+    print("=== Testing BetaDistribution (vectorized / conjugate) ===")
+
+    from scipy.stats import beta
+
+    x = np.linspace(0.01, 0.99, 50)
+    dist = BetaDistribution(a=2.0, b=5.0)
+    assert np.allclose(dist.log_pdf(x), beta.logpdf(x, 2.0, 5.0))
+    assert isinstance(dist.pdf(0.3), float)
+    assert dist.log_pdf(1.5) == -np.inf
+
+    samples = dist.sample(20000, rng=np.random.default_rng(0))
+    assert abs(samples.mean() - 2 / 7) < 0.01
+
+    # scalar Bernoulli updates
+    dist.update_bernoulli([1, 0, 1, 1])
+    assert (dist.a, dist.b) == (5.0, 6.0)
+    assert np.isclose(dist.pdf(0.4), beta.pdf(0.4, 5.0, 6.0))
+
+    # batched Binomial updates over many (a, b) pairs, repeated indices accumulate
+    a0 = np.ones(4)
+    batch = BetaDistribution(a0, np.ones(4))
+    batch.update_binomial(k=[3, 1, 2], n=[5, 1, 4], index=[0, 2, 0])
+    assert np.allclose(batch.a, [6, 1, 2, 1])
+    assert np.all(a0 == 1)  # caller's array untouched
+    assert np.allclose(batch.b, [5, 1, 1, 1])
+    assert np.allclose(batch.log_pdf(0.3), beta.logpdf(0.3, batch.a, batch.b))
+
+    print("Posterior pairs:", list(zip(batch.a, batch.b)))
+    print()
+
+
 def test_dirichlet():
     print("=== Testing DirichletDistribution ===")
 
@@ -149,7 +253,50 @@ def test_dirichlet():
     print()
 
 
+def test_dirichlet_vectorized():
+    print("=== Testing DirichletDistribution (vectorized) ===")
+
+    from scipy.stats import dirichlet
+
+    rng = np.random.default_rng(0)
+    x = rng.dirichlet([1.0, 2.0, 3.0], size=200)
+    alphas = np.array([[2.0, 3.0, 4.0], [0.5, 1.0, 5.0], [3.0, 1.0, 1.0]])
+
+    single = DirichletDistribution(alphas[0])
+    assert np.allclose(single.log_pdf(x), [dirichlet.logpdf(p, alphas[0]) for p in x])
+
+    stacked = DirichletDistribution.stack([DirichletDistribution(a) for a in alphas])
+    expected = np.array([[dirichlet.logpdf(p, a) for a in alphas] for p in x])
+    assert stacked.log_pdf(x).shape == (200, 3)
+    assert np.allclose(stacked.log_pdf(x), expected)
+
+    # fast mode skips validation; validated mode rejects off-simplex points
+    fast = DirichletDistribution(alphas[0], validate=False)
+    assert np.allclose(fast.log_pdf(x), single.log_pdf(x))
+    try:
+        single.log_pdf([0.5, 0.5, 0.5])
+        raise AssertionError("off-simplex point accepted")
+    except ValueError:
+        pass
+
+    # faces of the simplex are fine where alpha_k >= 1, as in scipy
+    assert np.isclose(DirichletDistribution([1.0, 2.0, 2.0]).pdf([0.0, 0.5, 0.5]),
+                      dirichlet.pdf([0.0, 0.5, 0.5], [1.0, 2.0, 2.0]))
+    try:
+        DirichletDistribution([0.5, 2.0, 2.0]).log_pdf([0.0, 0.5, 0.5])
+        raise AssertionError("unbounded face point accepted")
+    except ValueError:
+        pass
+
+    print("log-pdf matches scipy for", expected.shape, "point/alpha pairs")
+    print()
+
+
 if __name__ == "__main__":
     test_gaussian()
+    test_gaussian_numpy()
+    test_gaussian_conjugate()
     test_beta()
+    test_beta_vectorized_and_conjugate()
     test_dirichlet()
+    test_dirichlet_vectorized()
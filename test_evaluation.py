@@ -0,0 +1,72 @@
+# test_evaluation.py
+
+import numpy as np
+from pmrdb.evaluation import StreamingEvaluator, evaluate_parallel, evaluate_stream
+from fixtures import fitted_model
+
+
+# ---------------------------------------------------------
+# TEST 1 — Parallel evaluation matches the serial batch
+# ---------------------------------------------------------
+def test_evaluate_parallel():
+    print("\n=== Testing Parallel Evaluation ===")
+
+    db, X, y = fitted_model(20000)
+
+    serial = db.space.posterior_batch(X)
+    expected_acc = np.mean(np.array(db.space.hypotheses)[serial.argmax(axis=1)] == y)
+
+    for n_workers in (1, 2):
+        result = evaluate_parallel(db.space, X, y, n_workers=n_workers, shard_size=3000)
+        print(f"workers={n_workers} accuracy:", result["accuracy"])
+
+        assert np.allclose(result["posterior"], serial)
+        assert np.array_equal(result["predictions"], serial.argmax(axis=1))
+        assert np.isclose(result["accuracy"], expected_acc)
+        assert result["n"] == len(y)
+
+
+# ---------------------------------------------------------
+# TEST 2 — Streaming metrics match a full-array computation
+# ---------------------------------------------------------
+def test_streaming_evaluator():
+    print("\n=== Testing Streaming Evaluator ===")
+
+    rng = np.random.default_rng(3)
+    posterior = rng.dirichlet([1.0, 1.0, 1.0], size=5000)
+    labels = rng.integers(0, 3, 5000)
+
+    batches = ((posterior[s:s + 128], labels[s:s + 128]) for s in range(0, 5000, 128))
+    result = evaluate_stream(batches, n_bins=5)
+    print({k: v for k, v in result.items() if k != "reliability"})
+
+    rows = np.arange(5000)
+    onehot = np.eye(3)[labels]
+    confidence = posterior.max(axis=1)
+    hit = posterior.argmax(axis=1) == labels
+
+    assert np.isclose(result["accuracy"], hit.mean())
+    assert np.isclose(result["log_loss"], -np.log(posterior[rows, labels]).mean())
+    assert np.isclose(result["brier"], ((posterior - onehot) ** 2).sum(axis=1).mean())
+    assert result["reliability"]["count"].sum() == 5000
+
+    bins = np.minimum((confidence * 5).astype(int), 4)
+    ece = sum(
+        np.sum(bins == b) * abs(hit[bins == b].mean() - confidence[bins == b].mean())
+        for b in range(5) if np.any(bins == b)
+    ) / 5000
+    assert np.isclose(result["ece"], ece)
+
+    # merging two halves equals one pass
+    a = StreamingEvaluator(5).update(posterior[:2500], labels[:2500])
+    b = StreamingEvaluator(5).update(posterior[2500:], labels[2500:])
+    merged = a.merge(b).result()
+    assert np.isclose(merged["log_loss"], result["log_loss"])
+    assert np.allclose(merged["reliability"]["count"], result["reliability"]["count"])
+
+
+if __name__ == "__main__":
+    test_evaluate_parallel()
+    test_streaming_evaluator()
+
+    print("\nAll evaluation tests completed successfully.")
@@ -0,0 +1,117 @@
+# test_filtering.py
+
+import itertools
+
+import numpy as np
+from pmrdb.pmrdb import PMRDB
+from pmrdb.distributions import GaussianDistribution
+from pmrdb.probability_space import ProbabilitySpace
+from fixtures import labelled_data
+
+
+def make_space():
+    space = ProbabilitySpace(log_space=True)
+    space.set_priors({"UP": 0.5, "DOWN": 0.3, "FLAT": 0.2})
+    space.register_distribution_table("T", {
+        "UP": GaussianDistribution(1.5, 1.0),
+        "DOWN": GaussianDistribution(-1.0, 1.0),
+        "FLAT": GaussianDistribution(0.0, 1.0),
+    })
+    return space
+
+
+# ---------------------------------------------------------
+# TEST 1 — Static hypotheses: filtering = batch posterior
+# ---------------------------------------------------------
+def test_filter_static():
+    print("\n=== Testing Static Filter ===")
+
+    space = make_space()
+    ticks = np.array([[0.2, -1.1], [1.4, -0.3], [0.9, -2.0]])
+
+    filt = space.filter(n_streams=2)
+    for x in ticks:
+        post = filt.update({"T": x})
+    print("Filtered:\n", post)
+
+    # same as multiplying every tick's likelihood into the prior
+    log_lik = sum(space.modality_log_likelihoods("T", x) for x in ticks)
+    expected = np.exp(space.log_prior_array + log_lik)
+    expected /= expected.sum(axis=1, keepdims=True)
+    assert np.allclose(post, expected)
+
+    # a single stream takes scalar evidence, like compute_posterior
+    one = space.filter()
+    one.update({"T": 0.2})
+    assert np.allclose(one.posterior[0], space.posterior({"T": 0.2}, as_array=True))
+
+    # resetting one stream restarts it from the priors
+    filt.reset([1])
+    assert np.allclose(filt.posterior[1], space.prior_array)
+    assert np.allclose(filt.posterior[0], expected[0])
+
+
+# ---------------------------------------------------------
+# TEST 2 — Regime switching and fixed-lag smoothing
+# ---------------------------------------------------------
+def test_filter_transition_and_smoothing():
+    print("\n=== Testing Transition Filter / Fixed-Lag Smoothing ===")
+
+    space = make_space()
+    transition = np.array([[0.8, 0.1, 0.1], [0.2, 0.7, 0.1], [0.1, 0.2, 0.7]])
+    xs = np.random.default_rng(1).normal(0, 1.5, size=(5, 3))
+    lag = 2
+
+    filt = space.filter(n_streams=3, transition=transition, lag=lag)
+    prior = space.prior_array
+
+    for t in range(len(xs)):
+        post = filt.update({"T": xs[t]})
+        smoothed = filt.smoothed()
+
+        for s in range(3):
+            # brute force over every hypothesis path y_0 .. y_t
+            lik = np.exp(space.modality_log_likelihoods("T", xs[:t + 1, s]))
+            joint = np.zeros([3] * (t + 1))
+            for path in itertools.product(range(3), repeat=t + 1):
+                p = prior[path[0]] * lik[0, path[0]]
+                for u in range(1, t + 1):
+                    p *= transition[path[u - 1], path[u]] * lik[u, path[u]]
+                joint[path] = p
+
+            Z = joint.sum()
+            k = max(t - lag, 0)
+            assert np.allclose(post[s], joint.sum(axis=tuple(range(t))) / Z)
+            assert np.allclose(smoothed[s], joint.sum(axis=tuple(i for i in range(t + 1) if i != k)) / Z)
+            assert np.isclose(filt.log_evidence[s], np.log(Z))
+
+    print("Filtered:\n", post)
+    print("Smoothed (t - 2):\n", smoothed)
+
+
+# ---------------------------------------------------------
+# TEST 3 — PMRDB tick-by-tick filtering
+# ---------------------------------------------------------
+def test_pmrdb_filter():
+    print("\n=== Testing PMRDB Filter ===")
+
+    X, y = labelled_data(2000, signals={"T": (0.5, -0.5, 1.0), "V": (0.4, -0.4, 1.0)})
+
+    db = PMRDB()
+    db.fit(X, y)
+
+    filt = db.filter(transition=[[0.95, 0.05], [0.05, 0.95]])
+    for tick in [{"T": 0.4, "V": 0.3}, {"T": 0.6, "V": 0.1}, {"T": 0.2, "V": 0.4}]:
+        post = filt.update(tick)
+
+    up = db.space.hypotheses.index("UP")
+    print("P(UP) after 3 ticks:", post[0, up])
+    assert post[0, up] > db.compute_posterior({"T": 0.4, "V": 0.3})["UP"]
+
+
+if __name__ == "__main__":
+    test_filter_static()
+    test_filter_transition_and_smoothing()
+    test_pmrdb_filter()
+
+    print("\nAll filtering tests completed successfully.")
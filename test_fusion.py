@@ -5,6 +5,10 @@ from pmrdb.distributions import GaussianDistribution, DirichletDistribution
 from pmrdb.fusion import (
     fuse_gaussians,
     fuse_dirichlet,
+    fuse_gaussians_grouped,
+    fuse_dirichlet_grouped,
+    IncrementalGaussianFusion,
+    IncrementalDirichletFusion,
     multimodal_fusion,
     EvidenceFusion
 )
@@ -100,6 +104,105 @@ def test_evidence_fusion_wrapper():
     assert fused.var > 0
 
 
+# ---------------------------------------------------------
+# TEST 5 — Grouped fusion matches per-group fusion
+# ---------------------------------------------------------
+def test_grouped_fusion():
+    print("\n=== Testing Grouped Fusion ===")
+
+    rng = np.random.default_rng(0)
+    n, G = 500, 40
+    groups = rng.integers(0, G, n)
+    means = rng.normal(0, 5, n)
+    variances = rng.uniform(0.5, 4, n)
+    alphas = rng.uniform(0.5, 3, size=(n, 3))
+
+    fused_mean, fused_var = fuse_gaussians_grouped(means, variances, groups, n_groups=G)
+    fused_alpha = fuse_dirichlet_grouped(alphas, groups, n_groups=G)
+
+    for g in range(G):
+        rows = np.flatnonzero(groups == g)
+        ref = fuse_gaussians([GaussianDistribution(means[i], variances[i]) for i in rows])
+        assert np.isclose(fused_mean[g], ref.mean)
+        assert np.isclose(fused_var[g], ref.var)
+
+        ref = fuse_dirichlet([DirichletDistribution(alphas[i]) for i in rows])
+        assert np.allclose(fused_alpha[g], ref.alpha)
+
+    print("Group 0 fused mean/var:", fused_mean[0], fused_var[0])
+
+    # precision weights: weight 2 is the same opinion counted twice
+    m, v = fuse_gaussians_grouped([1.0, 3.0], [1.0, 1.0], [0, 0], weights=[2.0, 1.0])
+    m2, v2 = fuse_gaussians_grouped([1.0, 1.0, 3.0], [1.0, 1.0, 1.0], [0, 0, 0])
+    assert np.allclose([m, v], [m2, v2])
+
+
+# ---------------------------------------------------------
+# TEST 6 — Sliding-window incremental fusion
+# ---------------------------------------------------------
+def test_incremental_fusion():
+    print("\n=== Testing Sliding-window Fusion ===")
+
+    rng = np.random.default_rng(1)
+    W, K, T = 5, 8, 50
+    means = rng.normal(0, 3, size=(T, W))
+    variances = rng.uniform(0.5, 2, size=(T, W))
+    alphas = rng.uniform(0.5, 3, size=(T, W, 3))
+
+    gauss = IncrementalGaussianFusion(n_windows=W, window_size=K, resum_every=7)
+    dirich = IncrementalDirichletFusion(n_windows=W, window_size=K, dim=3)
+
+    for t in range(T):
+        gauss.push(means[t], variances[t])
+        dirich.push(alphas[t])
+
+    fused_mean, fused_var = gauss.fused()
+    for w in range(W):
+        ref = fuse_gaussians([GaussianDistribution(m, v)
+                              for m, v in zip(means[-K:, w], variances[-K:, w])])
+        assert np.isclose(fused_mean[w], ref.mean)
+        assert np.isclose(fused_var[w], ref.var)
+    assert np.allclose(dirich.fused(), alphas[-K:].sum(axis=0))
+
+    # evict the two oldest readings of window 0 only
+    gauss.evict([0])
+    gauss.evict([0])
+    precision = 1 / variances[-K + 2:, 0]
+    assert np.isclose(gauss.fused()[1][0], 1 / precision.sum())
+    assert gauss.count.tolist() == [K - 2] + [K] * (W - 1)
+
+    print("Window 0 fused mean/var:", gauss.fused()[0][0], gauss.fused()[1][0])
+
+
+# ---------------------------------------------------------
+# TEST 7 — Normalized fused density
+# ---------------------------------------------------------
+def test_fused_density():
+    print("\n=== Testing Fused Density ===")
+
+    g1 = GaussianDistribution(0, 1)
+    g2 = GaussianDistribution(5, 4)
+
+    fused = multimodal_fusion({
+        "A": {"dist": g1, "weight": 1.0},
+        "B": {"dist": g2, "weight": 1.0},
+    })
+
+    # N(0,1)^0.5 * N(5,4)^0.5 ∝ N(1, 1 / 0.625)
+    expected = GaussianDistribution(1.0, 1 / 0.625)
+
+    x = np.linspace(-4, 6, 101)
+    assert np.allclose(fused.pdf(x), expected.pdf(x), rtol=1e-4)
+    assert np.allclose(fused.log_pdf(x), expected.log_pdf(x), atol=1e-4)
+    assert np.allclose(fused(x), g1.pdf(x) ** 0.5 * g2.pdf(x) ** 0.5)
+
+    samples = fused.sample(50000, rng=np.random.default_rng(0))
+    print("Sample mean:", samples.mean(), "Expected:", 1.0)
+    print("Sample var :", samples.var(), "Expected:", 1 / 0.625)
+    assert abs(samples.mean() - 1.0) < 0.03
+    assert abs(samples.var() - 1 / 0.625) < 0.05
+
+
 # ---------------------------------------------------------
 # MAIN
 # ---------------------------------------------------------
@@ -108,5 +211,8 @@ if __name__ == "__main__":
     test_fuse_dirichlet()
     test_multimodal_fusion()
     test_evidence_fusion_wrapper()
+    test_grouped_fusion()
+    test_incremental_fusion()
+    test_fused_density()
 
     print("\nAll fusion tests completed successfully.")
@@ -8,8 +8,12 @@ This verifies that:
 are all working together.
 """
 
+import subprocess
+import sys
+
 import numpy as np
 from pmrdb.pmrdb import PMRDB
+from fixtures import labelled_data
 
 def test_pmrdb_pipeline():
     print("=== TEST: PMRDB End-to-End Synthetic Pipeline ===")
@@ -41,7 +45,144 @@ def test_pmrdb_pipeline():
     assert "uncertainty" in result
     assert result["uncertainty"]["variance"] >= 0.0
 
+    # shared likelihoods cover hypotheses added afterwards
+    db.space.add_hypothesis("FLAT", 0.2)
+    post = db.compute_posterior({"T": 0.1})
+    assert np.isclose(post["FLAT"], db.space.priors["FLAT"])
+
+    print("\nTEST PASSED ✔")
+
+def test_pmrdb_ensemble_forecast():
+    print("=== TEST: PMRDB Ensemble Forecast ===")
+
+    rng = np.random.default_rng(0)
+
+    db = PMRDB(seed=0)
+    db.set_modalities(rng.normal(0, 1, 50), rng.normal(3, 2, 50), rng.normal(-1, 0.5, 50))
+
+    observation = {"T": 0.2, "R": 2.5, "V": -1.2}
+
+    # shared likelihoods: every member leaves the prior unchanged
+    post = db.ensemble_posterior({m: [v] for m, v in observation.items()}, n_samples=200)
+    assert post.shape == (1, 200, 2)
+    assert np.allclose(post, 0.5)
+
+    # fast path: custom likelihoods only, nothing to sample
+    db.space.register_likelihood("custom", lambda x, h: 0.9 if h == "UP" else 0.1)
+    assert db.is_deterministic({"custom": 1.0})
+
+    result = db.forecast({"custom": 1.0}, n_samples=1000)
+    print(result)
+    assert np.isclose(result["posterior_probability_UP"], 0.9)
+    assert result["uncertainty"]["variance"] == 0.0
+
+    print("\nTEST PASSED ✔")
+
+
+def test_pmrdb_uncertainty_decomposition():
+    print("=== TEST: PMRDB Uncertainty Decomposition ===")
+
+    db = PMRDB()
+
+    # members agree on a coin flip: purely aleatoric
+    u = db.estimate_uncertainty(np.full((100, 2), 0.5))
+    assert np.isclose(u["aleatoric"], np.log(2))
+    assert np.isclose(u["epistemic"], 0.0)
+
+    # confident members that disagree: purely epistemic
+    u = db.estimate_uncertainty(np.tile([[1.0, 0.0], [0.0, 1.0]], (50, 1)))
+    assert np.isclose(u["aleatoric"], 0.0)
+    assert np.isclose(u["epistemic"], np.log(2))
+    assert np.isclose(u["total"], u["aleatoric"] + u["epistemic"])
+
+    # binary probabilities are accepted as a 1-D array
+    u = db.estimate_uncertainty(np.array([0.2, 0.4]))
+    assert np.isclose(u["mean"], 0.3)
+    assert np.isclose(u["variance"], 0.01)
+
+    # batched: (N, S, H) reduces per row
+    u = db.estimate_uncertainty(np.random.default_rng(0).dirichlet([1, 1, 1], size=(4, 1000)))
+    assert u["total"].shape == (4,)
+    assert np.all(u["epistemic"] >= 0)
+
+    print("\nTEST PASSED ✔")
+
+
+def test_pmrdb_fit():
+    print("=== TEST: PMRDB Grouped Fit ===")
+
+    X, y = labelled_data(5000, seed=1, p_up=0.3,
+                         signals={"T": (0.5, -0.5, 0.3), "V": (0.4, -0.4, 0.2)})
+    up = y == "UP"
+
+    db = PMRDB(seed=0)
+    db.fit(X, y, fit_priors=True)
+
+    for m in X:
+        p = db.params[m]
+        assert np.allclose(p["mean"], [X[m][up].mean(), X[m][~up].mean()])
+        assert np.allclose(p["var"], [X[m][up].var() + 1e-6, X[m][~up].var() + 1e-6])
+    assert np.isclose(db.space.priors["UP"], up.mean())
+
+    post = db.compute_posterior({"T": 0.45, "V": 0.35})
+    print("Posterior:", post)
+    assert post["UP"] > 0.9
+
+    # per-hypothesis parameters give the ensemble real spread
+    result = db.forecast({"T": 0.0, "V": 0.0}, n_samples=500)
+    print(result)
+    assert result["uncertainty"]["variance"] > 0.0
+    assert result["uncertainty"]["epistemic"] > 0.0
+
     print("\nTEST PASSED ✔")
 
+
+def test_pmrdb_forecast_after_reregister():
+    print("=== TEST: PMRDB Forecast After Re-registering a Modality ===")
+
+    X, y = labelled_data(2000)
+    db = PMRDB(seed=0)
+    db.fit(X, y)
+
+    # replace the fitted T Gaussians: forecasts must follow the new model
+    db.space.register_likelihood("T", lambda x, h: 0.99 if h == "DOWN" else 0.01)
+    assert db.is_deterministic({"T": 0.5})
+    assert "T" not in db.sample_parameters(10)
+
+    expected = db.compute_posterior({"T": 0.5})["UP"]
+    result = db.forecast({"T": 0.5}, n_samples=200)
+    batch = db.forecast_batch({"T": [0.5, -0.5]}, n_samples=200)
+    print(expected, result["posterior_probability_UP"])
+
+    assert np.isclose(expected, 0.01)
+    assert np.isclose(result["posterior_probability_UP"], expected)
+    assert np.allclose(batch["posterior_probability_UP"], expected)
+
+    # the still-fitted V keeps its ensemble; T enters as a fixed likelihood
+    post = db.ensemble_posterior({"T": [0.5], "V": [0.0]}, n_samples=200)
+    assert post[0, :, 0].std() > 0.0
+    assert np.all(post[0, :, 0] < 0.05)
+
+    print("\nTEST PASSED ✔")
+
+
+def test_pmrdb_import_is_lazy():
+    print("=== TEST: import pmrdb.pmrdb skips heavy dependencies ===")
+
+    code = (
+        "import sys, pmrdb.pmrdb; "
+        "print([m for m in ('torch', 'scipy.stats') if m in sys.modules])"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    print(out.stdout)
+
+    assert out.stdout.strip() == "[]"
+
+
 if __name__ == "__main__":
     test_pmrdb_pipeline()
+    test_pmrdb_ensemble_forecast()
+    test_pmrdb_uncertainty_decomposition()
+    test_pmrdb_fit()
+    test_pmrdb_forecast_after_reregister()
+    test_pmrdb_import_is_lazy()
@@ -1,4 +1,5 @@
 import numpy as np
+from pmrdb.distributions import GaussianDistribution, BetaDistribution, DirichletDistribution
 from pmrdb.probability_space import ProbabilitySpace
 
 
@@ -79,7 +80,324 @@ def test_probability_space_uniform_fallback():
     print("PASSED\n")
 
 
+def test_probability_space_posterior_batch():
+    print("=== TEST 4: Batched Posterior ===")
+
+    space = ProbabilitySpace()
+    space.set_priors({"UP": 0.5, "DOWN": 0.5})
+
+    # array-friendly likelihood
+    def like_traj(x, h):
+        mean = 0.0 if h == "UP" else 3.0
+        return np.exp(-0.5 * (x - mean) ** 2) / np.sqrt(2 * np.pi)
+
+    # scalar-only likelihood (float() rejects arrays)
+    def like_vol(x, h):
+        return space.gaussian_likelihood(x, 1 if h == "UP" else -1, 1)
+
+    space.register_likelihood("trajectory", like_traj)
+    space.register_likelihood("volatility", like_vol)
+
+    traj = np.array([0.1, 2.9, 1.5, 60.0])
+    vol = np.array([1.2, -0.8, 0.0, 50.0])
+
+    post = space.posterior_batch({"trajectory": traj, "volatility": vol})
+    print("Posterior:\n", post)
+
+    assert post.shape == (4, 2)
+    for i in range(len(traj)):
+        expected = space.posterior({"trajectory": traj[i], "volatility": vol[i]})
+        assert np.allclose(post[i], [expected[h] for h in space.hypotheses])
+
+    # no evidence: the prior for each of n_rows rows
+    assert np.allclose(space.posterior_batch({}, n_rows=3), 0.5)
+    for bad in ({}, {"trajectory": traj, "volatility": vol[:2]}):
+        try:
+            space.posterior_batch(bad)
+            raise AssertionError("invalid evidence accepted")
+        except ValueError:
+            pass
+    print("PASSED\n")
+
+
+def test_probability_space_log_space():
+    print("=== TEST 5: Log-space Inference ===")
+
+    # 40 sharp modalities: the linear product underflows to zero
+    def like(x, h):
+        return space.gaussian_likelihood(x, 0.0 if h == "UP" else 0.5, 0.01)
+
+    def log_like(x, h):
+        return space.gaussian_log_likelihood(x, 0.0 if h == "UP" else 0.5, 0.01)
+
+    evidence = {f"m{i}": 0.2 for i in range(40)}
+
+    space = ProbabilitySpace()
+    space.set_priors({"UP": 0.5, "DOWN": 0.5})
+    for m in evidence:
+        space.register_likelihood(m, like)
+    print("Linear posterior:", space.posterior(evidence))
+    assert space.posterior(evidence)["UP"] == 0.5
+
+    space = ProbabilitySpace(log_space=True)
+    space.set_priors({"UP": 0.5, "DOWN": 0.5})
+    for m in evidence:
+        space.register_log_likelihood(m, log_like)
+
+    post = space.posterior(evidence)
+    print("Log-space posterior:", post)
+    assert post["UP"] > 0.999
+
+    batch = space.posterior_batch({m: np.array([0.2, 0.3]) for m in evidence})
+    assert np.allclose(batch[0], [post["UP"], post["DOWN"]])
+    assert batch[1, 1] > 0.999
+
+    # joint log-likelihood stays finite where the linear product underflows
+    space.register_likelihood("linear", lambda x, h: 0.25)
+    joint = dict(evidence, linear=1.0)
+    expected = 40 * log_like(0.2, "DOWN") + np.log(0.25)
+    assert space.joint_likelihood(joint, "DOWN") == 0.0
+    assert np.isclose(space.joint_log_likelihood(joint, "DOWN"), expected)
+    assert np.isclose(space.joint_log_likelihood({"m0": 0.2, "linear": 1.0}, "UP"),
+                      np.log(space.joint_likelihood({"m0": 0.2, "linear": 1.0}, "UP")))
+    print("PASSED\n")
+
+
+def test_probability_space_cache():
+    print("=== TEST 6: Posterior Cache ===")
+
+    calls = []
+
+    def like(x, h):
+        calls.append(x)
+        return space.gaussian_likelihood(x, 0 if h == "UP" else 3, 1)
+
+    space = ProbabilitySpace()
+    space.set_priors({"UP": 0.5, "DOWN": 0.5})
+    space.register_likelihood("trajectory", like)
+    space.enable_cache(maxsize=2, decimals=1)
+
+    first = space.posterior({"trajectory": 0.21})
+    assert space.posterior({"trajectory": 0.19}) == first    # same bucket
+    assert len(calls) == 2                                  # one call per hypothesis
+    assert calls == [0.2, 0.2]                              # scored at the bucket value
+
+    space.posterior({"trajectory": 1.0})
+    space.posterior({"trajectory": 2.0})                     # evicts 0.2
+    space.posterior({"trajectory": 0.2})
+    info = space.cache_info()
+    print("Cache info:", info)
+    assert info == {"hits": 1, "misses": 4, "size": 2, "maxsize": 2}
+
+    # unhashable non-numeric evidence bypasses the cache
+    space.register_likelihood("tags", lambda x, h: 0.7 if ("up" in x) == (h == "UP") else 0.3)
+    before = space.cache_info()
+    assert space.posterior({"tags": {"up"}})["UP"] == 0.7
+    assert space.cache_info() == before
+
+    # model change invalidates
+    space.set_priors({"UP": 0.9, "DOWN": 0.1})
+    assert space.cache_info()["size"] == 0
+    assert space.posterior({"trajectory": 0.2})["UP"] > first["UP"]
+
+    # Dirichlet table: array evidence is keyed by its rounded values but
+    # scored as given, so simplex points stay on the simplex
+    space = ProbabilitySpace(log_space=True)
+    space.set_priors({"UP": 0.5, "DOWN": 0.5})
+    space.register_distribution_table("regime", {
+        "UP": DirichletDistribution([4.0, 2.0, 2.0]),
+        "DOWN": DirichletDistribution([2.0, 2.0, 4.0]),
+    })
+    space.enable_cache(decimals=2)
+
+    third = np.full(3, 1 / 3)
+    assert np.allclose(space.posterior({"regime": third}, as_array=True), 0.5)
+    near = space.posterior({"regime": [0.334, 0.333, 0.333]})
+    assert space.cache_info()["hits"] == 1 and np.isclose(near["UP"], 0.5)
+
+    # the key carries the shape: (2, 2) and (4,) evidence do not collide
+    space.register_likelihood("grid", lambda x, h: float(np.ndim(x)) if h == "UP" else 1.0)
+    flat = space.posterior({"grid": [0.1, 0.2, 0.3, 0.4]})
+    square = space.posterior({"grid": [[0.1, 0.2], [0.3, 0.4]]})
+    assert np.isclose(flat["UP"], 0.5) and np.isclose(square["UP"], 2 / 3)
+    print("PASSED\n")
+
+
+def test_probability_space_distribution_tables():
+    print("=== TEST 7: Distribution Tables ===")
+
+    space = ProbabilitySpace(log_space=True)
+    space.set_priors({"UP": 0.5, "DOWN": 0.3, "FLAT": 0.2})
+
+    space.register_distribution_table("trajectory", {
+        "UP": GaussianDistribution(0.5, 0.1),
+        "DOWN": GaussianDistribution(-0.5, 0.1),
+        "FLAT": GaussianDistribution(0.0, 0.05),
+    })
+    space.register_distribution_table("hit_rate", {
+        "UP": BetaDistribution(5, 2),
+        "DOWN": BetaDistribution(2, 5),
+        "FLAT": BetaDistribution(3, 3),
+    })
+    # (N, K) simplex points per row
+    space.register_distribution_table("regime", {
+        "UP": DirichletDistribution([3.0, 1.0, 1.0]),
+        "DOWN": DirichletDistribution([1.0, 3.0, 1.0]),
+        "FLAT": DirichletDistribution([1.0, 1.0, 3.0]),
+    })
+
+    columns = {
+        "trajectory": np.array([0.4, -0.6, 0.05]),
+        "hit_rate": np.array([0.7, 0.2, 0.5]),
+        "regime": np.array([[0.6, 0.2, 0.2], [0.1, 0.8, 0.1], [0.2, 0.2, 0.6]]),
+    }
+
+    post = space.posterior_batch(columns)
+    print("Posterior:\n", post)
+
+    assert list(np.argmax(post, axis=1)) == [0, 1, 2]
+    for i in range(3):
+        expected = space.posterior({m: v[i] for m, v in columns.items()})
+        assert np.allclose(post[i], [expected[h] for h in space.hypotheses])
+    print("PASSED\n")
+
+
+def test_probability_space_hypothesis_registry():
+    print("=== TEST 8: Bulk Hypothesis Registry ===")
+
+    # add_hypothesis keeps its renormalize-on-add semantics
+    space = ProbabilitySpace()
+    space.set_priors({"UP": 3.0, "DOWN": 1.0})
+    space.add_hypothesis("FLAT", 0.5)
+    print("Priors:", space.priors)
+
+    # FLAT: 0.5 / (1 + 0.5), the others scaled by 1 / 1.5
+    expected = {"UP": 0.5, "DOWN": 1 / 6, "FLAT": 1 / 3}
+    for h, p in expected.items():
+        assert np.isclose(space.priors[h], p)
+    assert np.isclose(space.prior_array.sum(), 1.0)
+
+    # register_prior assigns a raw prior: building priors one call at a
+    # time does not compound
+    space = ProbabilitySpace()
+    space.register_prior("UP", 0.6)
+    space.register_prior("DOWN", 0.4)
+    assert np.isclose(space.priors["UP"], 0.6)
+    assert np.isclose(space.priors["DOWN"], 0.4)
+
+    # on the scale of the current priors (0.75 / 0.25), not renormalized first
+    space.set_priors({"UP": 3.0, "DOWN": 1.0})
+    space.register_prior("FLAT", 0.25)
+    space.register_prior("UP", 0.25)
+    for h in space.hypotheses:
+        assert np.isclose(space.priors[h], 1 / 3)
+
+    # thousands of hypotheses in one call, posteriors as arrays
+    n_hyp = 5000
+    names = [f"H{i}" for i in range(n_hyp)]
+    means = np.linspace(-5, 5, n_hyp)
+
+    space = ProbabilitySpace(log_space=True)
+    space.add_hypotheses(names, np.ones(n_hyp))
+    space.register_distribution_table("x", {
+        h: GaussianDistribution(m, 0.01) for h, m in zip(names, means)
+    })
+
+    post = space.posterior({"x": means[1234]}, as_array=True)
+    assert post.shape == (n_hyp,) and np.isclose(post.sum(), 1.0)
+    assert np.argmax(post) == 1234
+    assert np.isclose(space.posterior({"x": means[1234]})["H1234"], post[1234])
+    assert np.array_equal(space.hypothesis_index(["H7", "H4999", "H7"]), [7, 4999, 7])
+    print("PASSED\n")
+
+
+def test_probability_space_topk():
+    print("=== TEST 9: Pruned Top-k Posterior ===")
+
+    rng = np.random.default_rng(0)
+    n_hyp = 3000
+    names = [f"H{i}" for i in range(n_hyp)]
+    mt, mv = rng.normal(0, 3, n_hyp), rng.normal(0, 3, n_hyp)
+
+    space = ProbabilitySpace(log_space=True)
+    space.add_hypotheses(names, rng.random(n_hyp))
+    space.register_distribution_table("T", {h: GaussianDistribution(m, 0.05) for h, m in zip(names, mt)})
+    space.register_distribution_table("V", {h: GaussianDistribution(m, 0.2) for h, m in zip(names, mv)})
+    # plain function: bounded only through upper_bounds
+    space.register_log_likelihood("R", lambda x, h: -abs(x - int(h[1:]) % 7))
+
+    evidence = {"T": mt[42], "V": mv[42], "R": 0}
+    full = space.posterior(evidence, as_array=True)
+
+    top = space.posterior_topk(evidence, k=5, upper_bounds={"R": 0.0})
+    print("Top-k:", top["hypotheses"], top["posterior"])
+    print("pruned mass <=", top["pruned_mass"], "evaluations:", top["evaluations"])
+
+    expected = np.argsort(-full)[:5]
+    assert np.array_equal(top["index"], expected)
+    assert np.allclose(top["posterior"], full[expected] / full[expected].sum())
+    assert top["pruned_mass"] >= 1 - full[expected].sum() - 1e-12
+    assert top["evaluations"] < 3 * n_hyp
+
+    # mass threshold; R is unbounded here, so it is scored first
+    kept = space.posterior_topk(evidence, tol=1e-9)
+    assert 1 - full[kept["index"]].sum() <= kept["pruned_mass"] + 1e-12 < 1e-6
+    assert kept["evaluations"] < 3 * n_hyp
+
+    # every kept hypothesis clears tol, and nothing dropped beats one kept
+    coarse = space.posterior_topk(evidence, tol=0.1, upper_bounds={"R": 0.0})
+    mass = full[coarse["index"]]
+    assert np.all(mass >= 0.1 * mass.sum() - 1e-12)
+    assert np.delete(full, coarse["index"]).max() <= mass.min()
+
+    # no evidence: the most probable priors
+    prior_top = space.posterior_topk({}, k=3)
+    assert np.array_equal(prior_top["index"], np.argsort(-space.prior_array)[:3])
+    print("PASSED\n")
+
+
+
+def test_probability_space_online_beta_updates():
+    print("=== TEST 10: Beta Tables Updated Online ===")
+
+    table = {"UP": BetaDistribution(1.0, 1.0), "DOWN": BetaDistribution(1.0, 1.0)}
+
+    space = ProbabilitySpace(log_space=True)
+    space.set_priors({"UP": 0.5, "DOWN": 0.5})
+    space.register_distribution_table("p", table)
+    space.enable_cache()
+
+    assert np.allclose(space.posterior({"p": 0.97}, as_array=True), 0.5)
+    assert np.allclose(space.posterior_batch({"p": [0.97, 0.2]}), 0.5)
+
+    # no refit: the stacked copy and the cached posterior follow the update
+    table["UP"].update_bernoulli([1] * 20)
+
+    fresh = ProbabilitySpace(log_space=True)
+    fresh.set_priors({"UP": 0.5, "DOWN": 0.5})
+    fresh.register_distribution_table("p", table)
+
+    post = space.posterior({"p": 0.97})
+    print("Posterior:", post)
+    assert post["UP"] > 0.9
+    assert np.isclose(post["UP"], fresh.posterior({"p": 0.97})["UP"])
+    assert np.allclose(space.posterior_batch({"p": [0.97, 0.2]}),
+                       fresh.posterior_batch({"p": [0.97, 0.2]}))
+
+    # updates to Betas outside the table leave it stacked
+    stacked = space._stacked_table("p")
+    BetaDistribution(1.0, 1.0).update(1, 0)
+    assert space._stacked_table("p") is stacked
+    print("PASSED\n")
+
 if __name__ == "__main__":
     test_probability_space_basic()
     test_probability_space_multimodal()
     test_probability_space_uniform_fallback()
+    test_probability_space_posterior_batch()
+    test_probability_space_log_space()
+    test_probability_space_cache()
+    test_probability_space_distribution_tables()
+    test_probability_space_hypothesis_registry()
+    test_probability_space_topk()
+    test_probability_space_online_beta_updates()
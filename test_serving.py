@@ -0,0 +1,91 @@
+# test_serving.py
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from pmrdb.serving import ForecastClient, ForecastServer
+from fixtures import fitted_model
+
+
+# ---------------------------------------------------------
+# TEST 1 — Batched responses match per-request forecasts
+# ---------------------------------------------------------
+def test_server_matches_forecast():
+    print("\n=== Testing Micro-Batched Forecasts ===")
+
+    db, _, _ = fitted_model(4000)
+    observations = [{"T": t, "V": v} for t, v in np.random.default_rng(1).normal(0, 1, (100, 2))]
+    # a different modality set is batched separately
+    observations += [{"T": 0.3}, {"T": -0.2}]
+
+    async def main(pool):
+        async with ForecastServer(db, max_batch=32, max_delay_ms=5, n_samples=1,
+                                  executor=pool, offload_min_batch=8) as server:
+            client = ForecastClient(server)
+            results = await client.forecast_many(observations)
+        return server, client, results
+
+    with ThreadPoolExecutor(2) as pool:
+        server, client, results = asyncio.run(main(pool))
+    print("batches:", server.n_batches, "latency:", client.latency_percentiles())
+
+    assert server.n_requests == len(observations)
+    assert server.n_batches <= 8
+    assert len(client.latencies) == len(observations)
+
+    for obs, result in zip(observations, results):
+        expected = db.forecast(obs, n_samples=1)
+        assert np.isclose(result["posterior_probability_UP"], expected["posterior_probability_UP"])
+        assert result["uncertainty"].keys() == expected["uncertainty"].keys()
+
+
+# ---------------------------------------------------------
+# TEST 2 — Ensembles, deadline flush and error propagation
+# ---------------------------------------------------------
+def test_server_deadline_and_errors():
+    print("\n=== Testing Deadline Flush / Errors ===")
+
+    db, _, _ = fitted_model(4000)
+
+    async def main():
+        server = await ForecastServer(db, max_batch=1000, max_delay_ms=1, n_samples=100).start()
+
+        # far below max_batch: answered once the deadline passes
+        result = await asyncio.wait_for(server.forecast({"T": 0.4, "V": 0.3}), timeout=5)
+
+        try:
+            await server.forecast({"X": 1.0})
+            raised = False
+        except ValueError:
+            raised = True
+
+        # a ragged observation fails its own batch only
+        bad = await asyncio.gather(server.forecast({"T": [1.0, 2.0]}), server.forecast({"T": [1.0]}),
+                                   return_exceptions=True)
+        after = await asyncio.wait_for(server.forecast({"T": 0.1}), timeout=5)
+
+        await server.stop()
+        try:
+            await server.forecast({"T": 0.1})
+            rejected = False
+        except RuntimeError:
+            rejected = True
+
+        return result, raised, bad, after, rejected
+
+    result, raised, bad, after, rejected = asyncio.run(main())
+    print(result)
+
+    assert raised and rejected
+    assert all(isinstance(b, ValueError) for b in bad)
+    assert 0.0 < after["posterior_probability_UP"] < 1.0
+    assert 0.5 < result["posterior_probability_UP"] < 1.0
+    assert result["uncertainty"]["epistemic"] >= 0.0
+
+
+if __name__ == "__main__":
+    test_server_matches_forecast()
+    test_server_deadline_and_errors()
+
+    print("\nAll serving tests completed successfully.")
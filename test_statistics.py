@@ -0,0 +1,111 @@
+# test_statistics.py
+
+import os
+import tempfile
+
+import numpy as np
+from pmrdb.pmrdb import PMRDB
+from pmrdb.statistics import GaussianSufficientStatistics, iter_chunks
+from fixtures import labelled_data
+
+
+def make_data(n=10000, seed=0):
+    return labelled_data(n, seed, p_up=0.4,
+                         signals={"T": (0.5, -0.5, 0.3), "R": (2.0, 3.0, 1.0)})
+
+
+# ---------------------------------------------------------
+# TEST 1 — Shard merge is exact
+# ---------------------------------------------------------
+def test_merge_shards():
+    print("\n=== Testing Shard Merge ===")
+
+    rng = np.random.default_rng(0)
+    data = rng.normal(5.0, 2.0, size=(3000, 2))
+    idx = rng.integers(0, 3, 3000)
+
+    full = GaussianSufficientStatistics(["a", "b", "c"], ["x", "y"]).update(data, idx)
+
+    shards = [GaussianSufficientStatistics(["a", "b", "c"], ["x", "y"]) for _ in range(3)]
+    for shard, rows in zip(shards, np.array_split(np.arange(3000), 3)):
+        shard.update(data[rows], idx[rows])
+
+    merged = shards[0].merge(shards[1]).merge(shards[2])
+
+    for h in range(3):
+        rows = data[idx == h]
+        assert np.isclose(merged.count[h], len(rows))
+        assert np.allclose(merged.mean[h], rows.mean(axis=0))
+        assert np.allclose(merged.var[h], rows.var(axis=0))
+
+    assert np.allclose(merged.m2, full.m2)
+    print("Merged var:", merged.var[0], "Expected:", data[idx == 0].var(axis=0))
+
+
+# ---------------------------------------------------------
+# TEST 2 — Streaming fit from memory-mapped chunks
+# ---------------------------------------------------------
+def test_fit_stream_memmap():
+    print("\n=== Testing Streaming Fit (memmap) ===")
+
+    X, y = make_data()
+
+    batch = PMRDB()
+    batch.fit(X, y)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for m, col in X.items():
+            np.save(os.path.join(tmp, f"{m}.npy"), col)
+        mapped = {m: np.load(os.path.join(tmp, f"{m}.npy"), mmap_mode="r") for m in X}
+
+        stream = PMRDB()
+        stream.fit_stream(iter_chunks(mapped, y, chunk_size=777))
+        # refitting on the same stream replaces, not doubles, the counts
+        stream.fit_stream(iter_chunks(mapped, y, chunk_size=777))
+
+    assert np.array_equal(stream.params["T"]["n"], batch.params["T"]["n"])
+    for m in X:
+        assert np.allclose(stream.params[m]["mean"], batch.params[m]["mean"])
+        assert np.allclose(stream.params[m]["var"], batch.params[m]["var"])
+
+    print("Streamed T means:", stream.params["T"]["mean"])
+
+
+# ---------------------------------------------------------
+# TEST 3 — Incremental refit and model merge
+# ---------------------------------------------------------
+def test_partial_fit_and_merge():
+    print("\n=== Testing partial_fit / merge ===")
+
+    X, y = make_data(seed=1)
+    half = len(y) // 2
+    first = {m: c[:half] for m, c in X.items()}
+    second = {m: c[half:] for m, c in X.items()}
+
+    batch = PMRDB()
+    batch.fit(X, y)
+
+    online = PMRDB()
+    online.partial_fit(first, y[:half])
+    online.partial_fit(second, y[half:])
+
+    a, b = PMRDB(), PMRDB()
+    a.fit(first, y[:half])
+    b.fit(second, y[half:])
+    a.merge(b)
+
+    obs = {"T": 0.1, "R": 2.4}
+    expected = batch.compute_posterior(obs)
+    for db in (online, a):
+        post = db.compute_posterior(obs)
+        assert np.isclose(post["UP"], expected["UP"])
+
+    print("Posterior:", expected)
+
+
+if __name__ == "__main__":
+    test_merge_shards()
+    test_fit_stream_memmap()
+    test_partial_fit_and_merge()
+
+    print("\nAll statistics tests completed successfully.")
@@ -0,0 +1,90 @@
+# test_synthetic_data.py
+
+import os
+import tempfile
+
+import numpy as np
+from synthetic_data.datasets import SyntheticColumnarDataset, SyntheticMultimodalExample
+from synthetic_data.generator import SyntheticDataGenerator
+
+
+# ---------------------------------------------------------
+# TEST 1 — Columnar generation
+# ---------------------------------------------------------
+def test_generate_columns():
+    print("\n=== Testing Columnar Generation ===")
+
+    cols = SyntheticDataGenerator(n_samples=20000, seed=0).generate_columns()
+
+    label = cols["label"]
+    up = label == 1
+    assert label.dtype == np.int8 and label.shape == (20000,)
+    assert cols["regime_alpha"].shape == (20000, 3)
+
+    print("UP trajectory mean  :", cols["trajectory_mean"][up].mean())
+    print("DOWN trajectory mean:", cols["trajectory_mean"][~up].mean())
+
+    assert abs(cols["trajectory_mean"][up].mean() - 0.5) < 0.02
+    assert abs(cols["volatility_mean"][~up].mean() + 0.4) < 0.02
+    assert np.all(cols["trajectory_var"] >= 0.1)
+    assert np.all(cols["volatility_var"] >= 0.05)
+    assert np.argmax(cols["regime_alpha"][up].mean(axis=0)) == 0
+    assert np.argmax(cols["regime_alpha"][~up].mean(axis=0)) == 1
+
+
+# ---------------------------------------------------------
+# TEST 2 — Chunked generation and object view
+# ---------------------------------------------------------
+def test_generate_chunks_and_objects():
+    print("\n=== Testing Chunked Generation / Object View ===")
+
+    chunks = list(SyntheticDataGenerator(n_samples=1050, seed=0).generate_columns(chunk_size=500))
+    assert [len(c["label"]) for c in chunks] == [500, 500, 50]
+
+    examples = SyntheticDataGenerator(n_samples=5, seed=1).generate()
+    cols = SyntheticDataGenerator(n_samples=5, seed=1).generate_columns()
+
+    print(examples)
+    assert all(isinstance(e, SyntheticMultimodalExample) for e in examples)
+    assert [e.label for e in examples] == cols["label"].tolist()
+    assert np.allclose(examples[2].regime["alpha"], cols["regime_alpha"][2])
+    assert examples[4].trajectory["mean"] == cols["trajectory_mean"][4]
+
+
+# ---------------------------------------------------------
+# TEST 3 — Columnar dataset save / memory-mapped load
+# ---------------------------------------------------------
+def test_columnar_dataset_save_load():
+    print("\n=== Testing Columnar Dataset Save/Load ===")
+
+    ds = SyntheticDataGenerator(n_samples=1000, seed=2).generate_columns()
+    print(ds, ds.nbytes, "bytes")
+    assert ds.nbytes == 1000 * (8 * 4 + 8 * 3 + 1)
+
+    # slicing is a view
+    sub = ds[100:200]
+    assert len(sub) == 100 and np.shares_memory(sub.regime_alpha, ds.regime_alpha)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ds")
+        ds.save(path)
+        mapped = SyntheticColumnarDataset.load(path)
+
+        assert isinstance(mapped.trajectory_mean, np.memmap)
+        for name, col in ds.columns().items():
+            assert np.array_equal(mapped[name], col)
+        assert mapped[7].label == ds[7].label
+
+        ds.save(os.path.join(tmp, "ds.npz"))
+        packed = SyntheticColumnarDataset.load(os.path.join(tmp, "ds.npz"))
+        assert np.array_equal(packed.regime_alpha, ds.regime_alpha)
+
+        del mapped
+
+
+if __name__ == "__main__":
+    test_generate_columns()
+    test_generate_chunks_and_objects()
+    test_columnar_dataset_save_load()
+
+    print("\nAll synthetic data tests completed successfully.")
@@ -1,7 +1,6 @@
 import numpy as np
 from pmrdb.pmrdb import PMRDB
-from pmrdb.distributions import GaussianDistribution
-from scipy.stats import norm
+from pmrdb.evaluation import evaluate_stream
 
 # ----------------------------------------------------------
 # 1. Generate synthetic data
@@ -54,46 +53,31 @@ def fit_distributions(db, X, y):
     # Extract trajectory feature (mean slope)
     slopes = np.array([np.mean(np.diff(x)) for x in X])
 
-    slopes_UP   = slopes[y == "UP"]
-    slopes_DOWN = slopes[y == "DOWN"]
-
-    # Fit 1D Gaussian for slope
-    dist_UP = GaussianDistribution(mean=np.mean(slopes_UP),
-                                   var=np.var(slopes_UP) + 1e-6)
-
-    dist_DOWN = GaussianDistribution(mean=np.mean(slopes_DOWN),
-                                     var=np.var(slopes_DOWN) + 1e-6)
-
-    # Register likelihood function
-    db.space.register_likelihood(
-        "trajectory",
-        lambda x, h: dist_UP.pdf(x) if h == "UP" else dist_DOWN.pdf(x)
-    )
+    # Fit one 1D Gaussian for slope per hypothesis
+    db.fit({"trajectory": slopes}, y)
 
 # ----------------------------------------------------------
 # 4. Evaluate PMRDB
 # ----------------------------------------------------------
 
-def evaluate(db, X, y):
+def evaluate(db, X, y, batch_size=64):
     print("Running evaluation...")
 
     slopes = np.array([np.mean(np.diff(x)) for x in X])
+    labels = db.space.hypothesis_index(y)
 
-    correct = 0
-    total = len(X)
-
-    for i in range(total):
-        obs = {"trajectory": slopes[i]}
-
-        posterior = db.space.posterior(obs)
-
-        pred = max(posterior, key=posterior.get)
+    def posterior_batches():
+        for start in range(0, len(slopes), batch_size):
+            stop = start + batch_size
+            post = db.space.posterior_batch({"trajectory": slopes[start:stop]})
+            yield post, labels[start:stop]
 
-        if pred == y[i]:
-            correct += 1
+    metrics = evaluate_stream(posterior_batches())
 
-    acc = correct / total
-    print(f"Accuracy: {acc:.3f}")
+    print(f"Accuracy: {metrics['accuracy']:.3f}")
+    print(f"Log-loss: {metrics['log_loss']:.4f}")
+    print(f"Brier   : {metrics['brier']:.4f}")
+    print(f"ECE     : {metrics['ece']:.4f}")
 
 # ----------------------------------------------------------
 # MAIN